@@ -1,5 +1,5 @@
 import argparse
-from os import makedirs, path
+from os import cpu_count, makedirs, path
 
 from typing import List, Mapping, Tuple
 from sim_output.animate_motion_profile import plot_profile
@@ -28,12 +28,22 @@ def read_arguments() -> Mapping[str, any]:
         type=str,
         help="The directory path for the output files")
 
+    parser.add_argument(
+        "-w",
+        "--workers",
+        action="store",
+        default=cpu_count(),
+        required=False,
+        type=int,
+        help="The number of processes used to draw the animation frames. Use 1 to draw all frames in the current process")
+
     args = parser.parse_args()
 
     return vars(args)
 
 def simulation_run_motion_profiles(arg_dict: Mapping[str, any]):
     output_directory: str = arg_dict["output"]
+    worker_count: int = arg_dict["workers"]
     print("Running motion profiles")
 
     print("Outputting to {}".format(output_directory))
@@ -90,7 +100,8 @@ def simulation_run_motion_profiles(arg_dict: Mapping[str, any]):
         velocities,
         accelerations,
         jerks,
-        plot_file_path)
+        plot_file_path,
+        worker_count=worker_count)
 
 def main(args=None):
     arg_dict = read_arguments()
@@ -2,13 +2,14 @@ import argparse
 from os import makedirs, path
 from pathlib import Path
 
-from typing import List, Mapping, NamedTuple, Tuple
+from typing import AbstractSet, List, Mapping, NamedTuple, Tuple
 from swerve_controller.geometry import RealNumberValueSpace
 from swerve_controller.profile import SingleVariableLinearProfile, SingleVariableSCurveProfile, SingleVariableTrapezoidalProfile, TransientVariableProfile
 import yaml
 from yaml.loader import SafeLoader
 
 # local
+from sim_output.animate_robot import ALL_PLOTS
 from sim_output.plots import plot_trajectories
 
 from swerve_controller.control import BodyMotionCommand, DriveModuleMotionCommand, MotionCommand
@@ -301,6 +302,16 @@ def read_arguments() -> Mapping[str, any]:
         help="Indicates if graphs should be generated or not. If not specified graphs will be created."
     )
 
+    parser.add_argument(
+        "-p",
+        "--plot",
+        action="append",
+        choices=sorted(ALL_PLOTS),
+        required=False,
+        type=str,
+        help="The name of a graph that should be drawn next to the robot motion. Can be provided multiple times. If not specified all graphs will be drawn."
+    )
+
     parser.add_argument(
         "-c",
         "--control-level",
@@ -389,6 +400,7 @@ def simulation_run_trajectories(arg_dict: Mapping[str, any]):
     do_not_draw_graphs: bool = arg_dict["no_graphs"]
     controller: str = arg_dict["control_level"]
     motion_profile: str = arg_dict["motion_profile"]
+    plots_enabled: AbstractSet[str] = ALL_PLOTS if arg_dict["plot"] is None else frozenset(arg_dict["plot"])
     print("Running trajectory simulation")
     print("Simulating motion for the following files:")
     for input_file in input_files:
@@ -399,7 +411,7 @@ def simulation_run_trajectories(arg_dict: Mapping[str, any]):
     drive_modules = get_drive_module_info()
     motions = get_motions(input_files)
     for motion_set in motions:
-        simulation_run_trajectory(output_directory, drive_modules, motion_set, controller, motion_profile, do_not_draw_graphs)
+        simulation_run_trajectory(output_directory, drive_modules, motion_set, controller, motion_profile, do_not_draw_graphs, plots_enabled)
 
 def simulation_run_trajectory(
     output_directory: str,
@@ -408,6 +420,7 @@ def simulation_run_trajectory(
     controller_name: str,
     motion_profile:str,
     do_not_draw_graphs: bool,
+    plots_enabled: AbstractSet[str] = ALL_PLOTS,
     ):
 
     if motion_profile == 'linear':
@@ -539,7 +552,8 @@ def simulation_run_trajectory(
             drive_modules,
             drive_states,
             icr_map,
-            "blue")
+            "blue",
+            plots_enabled)
 
 def main(args=None):
     arg_dict = read_arguments()
@@ -1,12 +1,24 @@
-from typing import List, Tuple
+from io import BytesIO
+from multiprocessing import Pool
+from os import cpu_count
+from typing import List, Optional, Tuple
 
+import numpy as np
 from matplotlib import pyplot as plt
-from matplotlib.animation import FuncAnimation, HTMLWriter
+from matplotlib.animation import FFMpegWriter, FuncAnimation, HTMLWriter
+from matplotlib.artist import Artist
 from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection
 from matplotlib.figure import Figure
 from matplotlib.gridspec import GridSpecBase
 from matplotlib.lines import Line2D
 
+try:
+    from fcntl import F_SETPIPE_SZ, fcntl
+except ImportError:
+    # The pipe size can only be changed on Linux
+    F_SETPIPE_SZ = None
+
 # local
 
 plt.rcParams["animation.ffmpeg_path"] = "ffmpeg"
@@ -21,11 +33,32 @@ class AnimationData(object):
         accelerations: List[List[float]],
         jerks: List[List[float]],
     ):
-        self.points_in_time = points_in_time
-        self.positions = positions
-        self.velocities = velocities
-        self.accelerations = accelerations
-        self.jerks = jerks
+        self.points_in_time = np.ascontiguousarray(points_in_time, dtype=np.float64)
+
+        # The values for each profile, stored with shape (profile count, point in time count) so
+        # that the values of all the profiles at a given point in time are a single column.
+        self.positions = np.ascontiguousarray(positions, dtype=np.float64)
+        self.velocities = np.ascontiguousarray(velocities, dtype=np.float64)
+        self.accelerations = np.ascontiguousarray(accelerations, dtype=np.float64)
+        self.jerks = np.ascontiguousarray(jerks, dtype=np.float64)
+
+        # The (time, value) points for each profile for each animation frame, stored with shape
+        # (profile count, frame count, 2). All values are known before the animation starts, so
+        # the points that are drawn up to a given frame are simply a view on these arrays. Only every
+        # ANIMATION_FRAME_DIVIDER-th point in time is drawn.
+        self.frame_times = self.points_in_time[::ANIMATION_FRAME_DIVIDER]
+        self.position_points = create_profile_points(
+            self.frame_times, self.positions[:, ::ANIMATION_FRAME_DIVIDER]
+        )
+        self.velocity_points = create_profile_points(
+            self.frame_times, self.velocities[:, ::ANIMATION_FRAME_DIVIDER]
+        )
+        self.acceleration_points = create_profile_points(
+            self.frame_times, self.accelerations[:, ::ANIMATION_FRAME_DIVIDER]
+        )
+        self.jerk_points = create_profile_points(
+            self.frame_times, self.jerks[:, ::ANIMATION_FRAME_DIVIDER]
+        )
 
 
 class AnimatedPlots(object):
@@ -50,10 +83,30 @@ class AnimatedPlots(object):
         self.ax_individual_accelerations = ax_individual_accelerations
         self.ax_individual_jerks = ax_individual_jerks
 
-        self.combined_positions: List[Line2D] = []
-        self.combined_velocities: List[Line2D] = []
-        self.combined_accelerations: List[Line2D] = []
-        self.combined_jerks: List[Line2D] = []
+        profile_count = len(ax_individual_positions)
+        profile_colors = motion_profile_colors[:profile_count]
+
+        # The collections don't provide a legend entry per profile, so the legends of the combined
+        # plots are made from lines that are not drawn.
+        self.combined_legend_lines: List[Line2D] = [
+            Line2D([], [], lw=2.5, color=profile_colors[index], label=pair[0])
+            for index, pair in enumerate(ax_individual_positions)
+        ]
+
+        # The lines for all the profiles in a combined plot are drawn by a single collection so that
+        # only one artist per combined plot has to be updated and drawn for every frame.
+        self.combined_positions: LineCollection = create_combined_lines(
+            ax_combined_positions, profile_colors, self.combined_legend_lines
+        )
+        self.combined_velocities: LineCollection = create_combined_lines(
+            ax_combined_velocities, profile_colors, self.combined_legend_lines
+        )
+        self.combined_accelerations: LineCollection = create_combined_lines(
+            ax_combined_accelerations, profile_colors, self.combined_legend_lines
+        )
+        self.combined_jerks: LineCollection = create_combined_lines(
+            ax_combined_jerks, profile_colors, self.combined_legend_lines
+        )
 
         self.individual_positions: List[Line2D] = []
         self.individual_velocities: List[Line2D] = []
@@ -64,82 +117,72 @@ class AnimatedPlots(object):
             name = pair[0]
             axes = pair[1]
             color_name = motion_profile_colors[index]
-            self.combined_positions.append(
-                ax_combined_positions.plot(
-                    [], [], lw=2.5, color=color_name, label=name
-                )[0]
-            )
             self.individual_positions.append(
                 axes.plot([], [], lw=2.5, color=color_name, label=name)[0]
             )
+            axes.legend(loc="upper right")
 
         for index, pair in enumerate(ax_individual_velocities):
             name = pair[0]
             axes = pair[1]
             color_name = motion_profile_colors[index]
-            self.combined_velocities.append(
-                ax_combined_velocities.plot(
-                    [], [], lw=2.5, color=color_name, label=name
-                )[0]
-            )
             self.individual_velocities.append(
                 axes.plot([], [], lw=2.5, color=color_name, label=name)[0]
             )
+            axes.legend(loc="upper right")
 
         for index, pair in enumerate(ax_individual_accelerations):
             name = pair[0]
             axes = pair[1]
             color_name = motion_profile_colors[index]
-            self.combined_accelerations.append(
-                ax_combined_accelerations.plot(
-                    [], [], lw=2.5, color=color_name, label=name
-                )[0]
-            )
             self.individual_accelerations.append(
                 axes.plot([], [], lw=2.5, color=color_name, label=name)[0]
             )
+            axes.legend(loc="upper right")
 
         for index, pair in enumerate(ax_individual_jerks):
             name = pair[0]
             axes = pair[1]
             color_name = motion_profile_colors[index]
-            self.combined_jerks.append(
-                ax_combined_jerks.plot([], [], lw=2.5, color=color_name, label=name)[0]
-            )
             self.individual_jerks.append(
                 axes.plot([], [], lw=2.5, color=color_name, label=name)[0]
             )
-
-    def legend_refresh(self):
-        self.ax_combined_positions.legend(loc="upper right")
-        self.ax_combined_velocities.legend(loc="upper right")
-        self.ax_combined_accelerations.legend(loc="upper right")
-        self.ax_combined_jerks.legend(loc="upper right")
-
-        for pair in self.ax_individual_positions:
-            axes = pair[1]
             axes.legend(loc="upper right")
 
-        for pair in self.ax_individual_velocities:
-            axes = pair[1]
-            axes.legend(loc="upper right")
 
-        for pair in self.ax_individual_accelerations:
-            axes = pair[1]
-            axes.legend(loc="upper right")
+class RgbaFrameWriter(FFMpegWriter):
+    # An ffmpeg writer that can also be given frames that have already been drawn as raw RGBA
+    # images, e.g. by a different process
+    def _run(self):
+        super()._run()
 
-        for pair in self.ax_individual_jerks:
-            axes = pair[1]
-            axes.legend(loc="upper right")
+        # A frame is several megabytes while a pipe only holds 64 kB by default on Linux, which
+        # means that writing a single frame takes hundreds of writes to the pipe. Enlarge the pipe
+        # to ffmpeg where that is possible.
+        if F_SETPIPE_SZ is not None:
+            try:
+                fcntl(
+                    self._proc.stdin.fileno(), F_SETPIPE_SZ, FFMPEG_PIPE_SIZE_IN_BYTES
+                )
+            except OSError:
+                # Unprivileged processes can't go over the limit in /proc/sys/fs/pipe-max-size,
+                # in which case the default pipe size is used
+                pass
+
+    def write_frame(self, frame: bytes):
+        self._proc.stdin.write(frame)
 
 
 ANIMATION_FRAME_DIVIDER: int = 1
+FFMPEG_PIPE_SIZE_IN_BYTES: int = 1024 * 1024
+PARALLEL_FRAMES_PER_WORKER: int = 10
 PLOT_AXIS_BUFFER_PERCENT: float = 0.1
 PLOT_TITLE_FONT_SIZE: int = 10
 PLOT_AXIS_FONT_SIZE: int = 8
 
 animation_data: AnimationData = None
 animated_plots: AnimatedPlots = None
+profile_figure: Figure = None
 
 motion_profile_colors: List[str] = [
     "orange",
@@ -153,23 +196,9 @@ motion_profile_colors: List[str] = [
 
 
 def animate(time_index: int):
-    positions = [
-        i[time_index * ANIMATION_FRAME_DIVIDER] for i in animation_data.positions
-    ]
-    velocities = [
-        i[time_index * ANIMATION_FRAME_DIVIDER] for i in animation_data.velocities
-    ]
-    accelerations = [
-        i[time_index * ANIMATION_FRAME_DIVIDER] for i in animation_data.accelerations
-    ]
-    jerks = [i[time_index * ANIMATION_FRAME_DIVIDER] for i in animation_data.jerks]
-    current_time = animation_data.points_in_time[time_index * ANIMATION_FRAME_DIVIDER]
-
-    frames: List[Line2D] = []
-
-    graph_frames = create_graph_frames(
-        current_time, positions, velocities, accelerations, jerks
-    )
+    frames: List[Artist] = []
+
+    graph_frames = create_graph_frames(time_index)
     frames.extend(graph_frames)
 
     return frames
@@ -191,6 +220,7 @@ def create_acceleration_plot(
         max + PLOT_AXIS_BUFFER_PERCENT * abs(max),
     )
     ax.set_xlim(0.0, time_max)
+    ax.set_autoscale_on(False)
 
     ax.set_title(
         "Acceleration for {} profile".format(profile_name),
@@ -204,52 +234,56 @@ def create_acceleration_plot(
     return ax
 
 
-def create_graph_frames(
-    current_time: float,
-    positions: List[float],
-    velocities: List[float],
-    accelerations: List[float],
-    jerks: List[float],
-) -> List[Line2D]:
-    plots: List[Line2D] = []
+def create_combined_lines(
+    ax: Axes, colors: List[str], legend_lines: List[Line2D]
+) -> LineCollection:
+    lines = LineCollection(
+        [], linewidths=2.5, colors=colors, capstyle="projecting", joinstyle="round"
+    )
+    ax.add_collection(lines, autolim=False)
+    ax.legend(handles=legend_lines, loc="upper right")
+
+    return lines
+
+
+def create_graph_frames(frame_index: int) -> List[Artist]:
+    plots: List[Artist] = []
 
     update_plots(
-        current_time,
-        positions,
+        frame_index,
+        animation_data.position_points,
         animated_plots.combined_positions,
         animated_plots.individual_positions,
     )
     update_plots(
-        current_time,
-        velocities,
+        frame_index,
+        animation_data.velocity_points,
         animated_plots.combined_velocities,
         animated_plots.individual_velocities,
     )
     update_plots(
-        current_time,
-        accelerations,
+        frame_index,
+        animation_data.acceleration_points,
         animated_plots.combined_accelerations,
         animated_plots.individual_accelerations,
     )
     update_plots(
-        current_time,
-        jerks,
+        frame_index,
+        animation_data.jerk_points,
         animated_plots.combined_jerks,
         animated_plots.individual_jerks,
     )
 
-    plots.extend(animated_plots.combined_positions)
-    plots.extend(animated_plots.combined_velocities)
-    plots.extend(animated_plots.combined_accelerations)
-    plots.extend(animated_plots.combined_jerks)
+    plots.append(animated_plots.combined_positions)
+    plots.append(animated_plots.combined_velocities)
+    plots.append(animated_plots.combined_accelerations)
+    plots.append(animated_plots.combined_jerks)
 
     plots.extend(animated_plots.individual_positions)
     plots.extend(animated_plots.individual_velocities)
     plots.extend(animated_plots.individual_accelerations)
     plots.extend(animated_plots.individual_jerks)
 
-    animated_plots.legend_refresh()
-
     return plots
 
 
@@ -269,6 +303,7 @@ def create_jerk_plot(
         max + PLOT_AXIS_BUFFER_PERCENT * abs(max),
     )
     ax.set_xlim(0.0, time_max)
+    ax.set_autoscale_on(False)
 
     ax.set_title(
         "Jerk for {} profile".format(profile_name), fontsize=PLOT_TITLE_FONT_SIZE
@@ -297,6 +332,7 @@ def create_position_plot(
         max + PLOT_AXIS_BUFFER_PERCENT * abs(max),
     )
     ax.set_xlim(0.0, time_max)
+    ax.set_autoscale_on(False)
 
     ax.set_title(
         "Position for {} profile".format(profile_name), fontsize=PLOT_TITLE_FONT_SIZE
@@ -309,71 +345,18 @@ def create_position_plot(
     return ax
 
 
-def create_velocity_plot(
-    profile_name: str,
-    profile_index: int,
-    min: float,
-    max: float,
-    fig: Figure,
-    grid: GridSpecBase,
-    time_max: float,
-) -> Axes:
-    ax = fig.add_subplot(grid[profile_index, 1])
-
-    ax.set_ylim(
-        min - PLOT_AXIS_BUFFER_PERCENT * abs(min),
-        max + PLOT_AXIS_BUFFER_PERCENT * abs(max),
-    )
-    ax.set_xlim(0.0, time_max)
-
-    ax.set_title(
-        "Velocity for {} profile".format(profile_name), fontsize=PLOT_TITLE_FONT_SIZE
-    )
-    ax.set_xlabel("Time (s)", fontsize=PLOT_AXIS_FONT_SIZE)
-    ax.set_ylabel("Velocity (m/s)", fontsize=PLOT_AXIS_FONT_SIZE)
-
-    ax.grid(linestyle="--", linewidth=0.5, color=".25", zorder=-10)
-
-    return ax
-
-
-def find_min_and_max_in_matrix(matrix: List[List[float]]) -> Tuple[float, float]:
-    max: float = -100
-    min: float = 100
-    for vector in matrix:
-        for number in vector:
-            if number < min:
-                min = number
-
-            if number > max:
-                max = number
-
-    return (min, max)
-
-
-def find_min_and_max_in_vector(vector: List[float]) -> Tuple[float, float]:
-    max: float = -100
-    min: float = 100
-    for number in vector:
-        if number < min:
-            min = number
-
-        if number > max:
-            max = number
-
-    return (min, max)
-
-
-def plot_profile(
+def create_profile_figure(
     profiles: List[str],
     points_in_time: List[float],
     positions: List[List[float]],
     velocities: List[List[float]],
     accelerations: List[List[float]],
     jerks: List[List[float]],
-    output_file_name_without_extension,
-):
-    fig = plt.figure(figsize=[25.0, 12.0], constrained_layout=True)
+    dpi: float,
+) -> Figure:
+    # Creates the figure with all the plots and sets up the animation data and the animated plots
+    # for it. The figure is laid out, so that only the lines need to be updated for each frame.
+    fig = plt.figure(figsize=[25.0, 12.0], dpi=dpi, constrained_layout=True)
     main_grid = fig.add_gridspec(len(profiles) + 1, 4)
 
     ax_individual_positions: List[Tuple[str, Axes]] = []
@@ -383,64 +366,87 @@ def plot_profile(
 
     time_max = points_in_time[-1]
 
+    # Find the bounds of each profile in a single pass over the values. The bounds of the shared
+    # plots are the bounds over all the profiles.
+    pos_mins, pos_maxes = find_min_and_max_per_profile(positions)
+    vel_mins, vel_maxes = find_min_and_max_per_profile(velocities)
+    acc_mins, acc_maxes = find_min_and_max_per_profile(accelerations)
+    jerk_mins, jerk_maxes = find_min_and_max_per_profile(jerks)
+
     # Create the shared plots
-    pos_min, pos_max = find_min_and_max_in_matrix(positions)
     ax_combined_positions = create_position_plot(
-        "all", 0, pos_min, pos_max, fig, main_grid, time_max
+        "all", 0, pos_mins.min(), pos_maxes.max(), fig, main_grid, time_max
     )
 
-    vel_min, vel_max = find_min_and_max_in_matrix(velocities)
     ax_combined_velocities = create_velocity_plot(
-        "all", 0, vel_min, vel_max, fig, main_grid, time_max
+        "all", 0, vel_mins.min(), vel_maxes.max(), fig, main_grid, time_max
     )
 
-    acc_min, acc_max = find_min_and_max_in_matrix(accelerations)
     ax_combined_accelerations = create_acceleration_plot(
-        "all", 0, acc_min, acc_max, fig, main_grid, time_max
+        "all", 0, acc_mins.min(), acc_maxes.max(), fig, main_grid, time_max
     )
 
-    jerk_min, jerk_max = find_min_and_max_in_matrix(jerks)
     ax_combined_jerks = create_jerk_plot(
-        "all", 0, jerk_min, jerk_max, fig, main_grid, time_max
+        "all", 0, jerk_mins.min(), jerk_maxes.max(), fig, main_grid, time_max
     )
 
     for index, profile in enumerate(profiles):
-        pos_min, pos_max = find_min_and_max_in_vector(positions[index])
         ax_individual_positions.append(
             (
                 profile,
                 create_position_plot(
-                    profile, index + 1, pos_min, pos_max, fig, main_grid, time_max
+                    profile,
+                    index + 1,
+                    pos_mins[index],
+                    pos_maxes[index],
+                    fig,
+                    main_grid,
+                    time_max,
                 ),
             )
         )
 
-        vel_min, vel_max = find_min_and_max_in_vector(velocities[index])
         ax_individual_velocities.append(
             (
                 profile,
                 create_velocity_plot(
-                    profile, index + 1, vel_min, vel_max, fig, main_grid, time_max
+                    profile,
+                    index + 1,
+                    vel_mins[index],
+                    vel_maxes[index],
+                    fig,
+                    main_grid,
+                    time_max,
                 ),
             )
         )
 
-        acc_min, acc_max = find_min_and_max_in_vector(accelerations[index])
         ax_individual_accelerations.append(
             (
                 profile,
                 create_acceleration_plot(
-                    profile, index + 1, acc_min, acc_max, fig, main_grid, time_max
+                    profile,
+                    index + 1,
+                    acc_mins[index],
+                    acc_maxes[index],
+                    fig,
+                    main_grid,
+                    time_max,
                 ),
             )
         )
 
-        jerk_min, jerk_max = find_min_and_max_in_vector(jerks[index])
         ax_individual_jerks.append(
             (
                 profile,
                 create_jerk_plot(
-                    profile, index + 1, jerk_min, jerk_max, fig, main_grid, time_max
+                    profile,
+                    index + 1,
+                    jerk_mins[index],
+                    jerk_maxes[index],
+                    fig,
+                    main_grid,
+                    time_max,
                 ),
             )
         )
@@ -468,51 +474,226 @@ def plot_profile(
 
     # fig.tight_layout(pad=1.0)
     # main_grid.tight_layout(fig)
-    animation = FuncAnimation(
-        fig,
-        animate,
-        frames=range(len(points_in_time) // ANIMATION_FRAME_DIVIDER),
-        interval=100,
-        blit=True,
-        repeat=True,
-        repeat_delay=10,
+
+    # The axis limits are all set before the animation starts, so the layout of the figure doesn't
+    # change between frames. Lay the figure out once and then stop the layout engine from running
+    # again for every frame that is drawn.
+    fig.canvas.draw()
+    fig.set_layout_engine("none")
+
+    return fig
+
+
+def create_profile_points(times: np.ndarray, values: np.ndarray) -> np.ndarray:
+    # Combines the times, (T,), with the values of each profile, (P, T), into the (P, T, 2) array
+    # of (time, value) points
+    points = np.empty(values.shape + (2,))
+    points[:, :, 0] = times
+    points[:, :, 1] = values
+
+    return points
+
+
+def create_velocity_plot(
+    profile_name: str,
+    profile_index: int,
+    min: float,
+    max: float,
+    fig: Figure,
+    grid: GridSpecBase,
+    time_max: float,
+) -> Axes:
+    ax = fig.add_subplot(grid[profile_index, 1])
+
+    ax.set_ylim(
+        min - PLOT_AXIS_BUFFER_PERCENT * abs(min),
+        max + PLOT_AXIS_BUFFER_PERCENT * abs(max),
+    )
+    ax.set_xlim(0.0, time_max)
+    ax.set_autoscale_on(False)
+
+    ax.set_title(
+        "Velocity for {} profile".format(profile_name), fontsize=PLOT_TITLE_FONT_SIZE
     )
+    ax.set_xlabel("Time (s)", fontsize=PLOT_AXIS_FONT_SIZE)
+    ax.set_ylabel("Velocity (m/s)", fontsize=PLOT_AXIS_FONT_SIZE)
 
-    # writer = FFMpegWriter()
-    # output_file_name = output_file_name_without_extension + ".mp4"
+    ax.grid(linestyle="--", linewidth=0.5, color=".25", zorder=-10)
 
-    # writer = PillowWriter(fps=25)
+    return ax
 
-    writer = HTMLWriter(fps=10)
-    output_file_name = output_file_name_without_extension + ".html"
 
-    animation.save(output_file_name, writer=writer)
+def find_min_and_max_per_profile(
+    matrix: List[List[float]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Returns the minimum and the maximum value of each profile, i.e. of each row of the matrix
+    values = np.asarray(matrix, dtype=np.float64)
+    return (values.min(axis=1), values.max(axis=1))
 
 
-def update_plots(
-    current_time: float,
-    values: List[float],
-    combined_values: List[Line2D],
-    individual_values: List[Line2D],
+def initialize_profile_worker(
+    profiles: List[str],
+    points_in_time: List[float],
+    positions: List[List[float]],
+    velocities: List[List[float]],
+    accelerations: List[List[float]],
+    jerks: List[List[float]],
+    dpi: float,
 ):
-    for index, value in enumerate(values):
-        # Combined positions
-        data = combined_values[index].get_data()
-        times: List[float] = list(data[0])
-        times.append(current_time)
+    # Creates the copy of the figure that a worker process draws its frames on
+    global profile_figure
+    profile_figure = create_profile_figure(
+        profiles, points_in_time, positions, velocities, accelerations, jerks, dpi
+    )
 
-        combined_plot_data: List[float] = list(data[1])
-        combined_plot_data.append(value)
 
-        combined_values[index].set_data(times, combined_plot_data)
+def plot_profile(
+    profiles: List[str],
+    points_in_time: List[float],
+    positions: List[List[float]],
+    velocities: List[List[float]],
+    accelerations: List[List[float]],
+    jerks: List[List[float]],
+    output_file_name_without_extension,
+    worker_count: Optional[int] = None,
+    dpi: float = 72,
+):
+    # By default the frames are drawn by one process per CPU. A worker count of 1 draws all frames
+    # in the current process, which is easier to debug.
+    if worker_count is None:
+        worker_count = cpu_count() or 1
+
+    # The time it takes to draw and encode the frames grows with the number of pixels in a frame,
+    # so a low resolution is used by default. Use a DPI of 100 or more for the final output.
+    fig = create_profile_figure(
+        profiles, points_in_time, positions, velocities, accelerations, jerks, dpi
+    )
+    frame_count = len(animation_data.frame_times)
 
-        # Individual position
-        data = individual_values[index].get_data()
-        times: List[float] = list(data[0])
-        times.append(current_time)
+    # writer = PillowWriter(fps=25)
 
-        individual_plot_data: List[float] = list(data[1])
-        individual_plot_data.append(value)
+    # Prefer piping the raw RGBA frames straight into ffmpeg so that long runs don't write a
+    # PNG file per frame to disk. Fall back to the HTML writer if ffmpeg isn't installed.
+    if FFMpegWriter.isAvailable():
+        writer = RgbaFrameWriter(
+            fps=10,
+            codec="libx264",
+            extra_args=[
+                "-preset",
+                "ultrafast",
+                "-tune",
+                "animation",
+                "-pix_fmt",
+                "yuv420p",
+            ],
+        )
+        output_file_name = output_file_name_without_extension + ".mp4"
+    else:
+        writer = HTMLWriter(fps=10)
+        output_file_name = output_file_name_without_extension + ".html"
+
+    # Drawing the frames is split over multiple processes when the frames are streamed to ffmpeg.
+    # Each process draws a range of frames on its own copy of the figure.
+    if worker_count > 1 and isinstance(writer, RgbaFrameWriter):
+        save_profile_in_parallel(
+            fig,
+            writer,
+            output_file_name,
+            frame_count,
+            worker_count,
+            (
+                profiles,
+                points_in_time,
+                positions,
+                velocities,
+                accelerations,
+                jerks,
+                dpi,
+            ),
+        )
+    else:
+        animation = FuncAnimation(
+            fig,
+            animate,
+            frames=range(frame_count),
+            interval=100,
+            blit=True,
+            repeat=True,
+            repeat_delay=10,
+            cache_frame_data=False,
+        )
+
+        animation.save(output_file_name, writer=writer)
+
+
+def render_profile_frames(frame_indices: range, dpi: float) -> List[bytes]:
+    # Draws the given frames on the figure of the current worker process and returns them as raw
+    # RGBA images, in the same format the ffmpeg writer sends to ffmpeg
+    frames: List[bytes] = []
+    for frame_index in frame_indices:
+        animate(frame_index)
+
+        buffer = BytesIO()
+        profile_figure.savefig(buffer, format="rgba", dpi=dpi)
+        frames.append(buffer.getvalue())
+
+    return frames
+
+
+def save_profile_in_parallel(
+    fig: Figure,
+    writer: RgbaFrameWriter,
+    output_file_name: str,
+    frame_count: int,
+    worker_count: int,
+    profile_data: Tuple[
+        List[str],
+        List[float],
+        List[List[float]],
+        List[List[float]],
+        List[List[float]],
+        List[List[float]],
+        float,
+    ],
+):
+    dpi = plt.rcParams["savefig.dpi"]
+    if dpi == "figure":
+        dpi = fig.dpi
+
+    # The frames are drawn in batches so that the workers can't get far ahead of ffmpeg, which
+    # would mean keeping a lot of drawn frames in memory
+    frames_per_batch = worker_count * PARALLEL_FRAMES_PER_WORKER
+    with Pool(
+        worker_count, initializer=initialize_profile_worker, initargs=profile_data
+    ) as pool:
+        with writer.saving(fig, output_file_name, dpi):
+            for batch_start in range(0, frame_count, frames_per_batch):
+                batch_end = min(batch_start + frames_per_batch, frame_count)
+                frame_ranges = [
+                    (
+                        range(
+                            start, min(start + PARALLEL_FRAMES_PER_WORKER, batch_end)
+                        ),
+                        dpi,
+                    )
+                    for start in range(
+                        batch_start, batch_end, PARALLEL_FRAMES_PER_WORKER
+                    )
+                ]
+                for frames in pool.starmap(render_profile_frames, frame_ranges):
+                    for frame in frames:
+                        writer.write_frame(frame)
+
+
+def update_plots(
+    frame_index: int,
+    points: np.ndarray,
+    combined_values: LineCollection,
+    individual_values: List[Line2D],
+):
+    # Only hand the points up to and including the current frame to the plots
+    drawn_points = points[:, : frame_index + 1]
 
-        individual_values[index].set_data(times, individual_plot_data)
-        individual_values[index].set_data(times, individual_plot_data)
+    combined_values.set_segments(drawn_points)
+    for index, individual_value in enumerate(individual_values):
+        individual_value.set_data(drawn_points[index, :, 0], drawn_points[index, :, 1])
@@ -1,12 +1,13 @@
-import math
-from typing import List, Tuple
+from typing import AbstractSet, Dict, FrozenSet, List, Tuple
 
 import numpy as np
 from matplotlib import pyplot as plt
-from matplotlib.animation import FuncAnimation, HTMLWriter
+from matplotlib.animation import FFMpegWriter, HTMLWriter
+from matplotlib.artist import Artist
 from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection
 from matplotlib.figure import Figure
-from matplotlib.gridspec import GridSpec
+from matplotlib.gridspec import GridSpec, SubplotSpec
 from matplotlib.lines import Line2D
 
 # local
@@ -18,128 +19,128 @@ from swerve_controller.states import BodyState
 plt.rcParams["animation.ffmpeg_path"] = "ffmpeg"
 
 
+class GraphValues(object):
+    def __init__(
+        self,
+        body_linear_velocities: np.ndarray,
+        body_linear_accelerations: np.ndarray,
+        body_linear_jerks: np.ndarray,
+        body_angular_velocities: np.ndarray,
+        body_angular_accelerations: np.ndarray,
+        body_angular_jerks: np.ndarray,
+        module_orientations: np.ndarray,
+        module_orientation_velocities: np.ndarray,
+        module_orientation_accelerations: np.ndarray,
+        module_orientation_jerks: np.ndarray,
+        module_velocities: np.ndarray,
+        module_accelerations: np.ndarray,
+        module_jerks: np.ndarray,
+    ):
+        # The linear body values, (T, 2), stored as (x, y) pairs
+        self.body_linear_velocities = body_linear_velocities
+        self.body_linear_accelerations = body_linear_accelerations
+        self.body_linear_jerks = body_linear_jerks
+
+        # The angular body values, (T,)
+        self.body_angular_velocities = body_angular_velocities
+        self.body_angular_accelerations = body_angular_accelerations
+        self.body_angular_jerks = body_angular_jerks
+
+        # The drive module values, (T, N)
+        self.module_orientations = module_orientations
+        self.module_orientation_velocities = module_orientation_velocities
+        self.module_orientation_accelerations = module_orientation_accelerations
+        self.module_orientation_jerks = module_orientation_jerks
+        self.module_velocities = module_velocities
+        self.module_accelerations = module_accelerations
+        self.module_jerks = module_jerks
+
+    def every_nth_point_in_time(self, step: int) -> "GraphValues":
+        return GraphValues(
+            self.body_linear_velocities[::step],
+            self.body_linear_accelerations[::step],
+            self.body_linear_jerks[::step],
+            self.body_angular_velocities[::step],
+            self.body_angular_accelerations[::step],
+            self.body_angular_jerks[::step],
+            self.module_orientations[::step],
+            self.module_orientation_velocities[::step],
+            self.module_orientation_accelerations[::step],
+            self.module_orientation_jerks[::step],
+            self.module_velocities[::step],
+            self.module_accelerations[::step],
+            self.module_jerks[::step],
+        )
+
+
 class AnimationData(object):
     def __init__(
         self,
-        ax_robot: Axes,
-        ax_body_velocity: Axes,
-        ax_body_acceleration: Axes,
-        ax_body_jerk: Axes,
-        ax_body_angular_velocity: Axes,
-        ax_body_angular_acceleration: Axes,
-        ax_body_angular_jerk: Axes,
-        ax_module_orientation: Axes,
-        ax_module_angular_velocity: Axes,
-        ax_module_velocity: Axes,
-        ax_module_acceleration: Axes,
-        points_in_time: List[float],
-        drive_modules: List[DriveModule],
-        body_states: List[BodyState],
-        drive_module_states: List[List[DriveModuleMeasuredValues]],
-        icr_coordinate_map: List[
-            Tuple[
-                float,
-                List[
-                    Tuple[DriveModuleMeasuredValues, DriveModuleMeasuredValues, Point]
-                ],
-            ]
-        ],
+        points_in_time: np.ndarray,
+        graph_values: GraphValues,
+        module_graph_points: Dict[str, np.ndarray],
+        body_positions: np.ndarray,
+        body_outlines: np.ndarray,
+        wheels: np.ndarray,
+        icr_lines: np.ndarray,
+        icr_points: np.ndarray,
     ):
-        self.ax_robot = ax_robot
-        self.ax_body_velocity = ax_body_velocity
-        self.ax_body_acceleration = ax_body_acceleration
-        self.ax_body_jerk = ax_body_jerk
-        self.ax_body_angular_velocity = ax_body_angular_velocity
-        self.ax_body_angular_acceleration = ax_body_angular_acceleration
-        self.ax_body_angular_jerk = ax_body_angular_jerk
-        self.ax_module_orientation = ax_module_orientation
-        self.ax_module_angular_velocity = ax_module_angular_velocity
-        self.ax_module_velocity = ax_module_velocity
-        self.ax_module_acceleration = ax_module_acceleration
+        # The points in time of the frames, (T,)
         self.points_in_time = points_in_time
-        self.drive_modules = drive_modules
-        self.body_states = body_states
-        self.drive_module_states = drive_module_states
-        self.icr_coordinate_map = icr_coordinate_map
+
+        # The values that are drawn in the graphs, and the points of the lines in the drive module
+        # graphs, (N, T, 2), by graph name
+        self.graph_values = graph_values
+        self.module_graph_points = module_graph_points
+
+        # The body position for each point in time, (T, 2)
+        self.body_positions = body_positions
+
+        # The geometry of the robot for each point in time
+        self.body_outlines = body_outlines
+        self.wheels = wheels
+        self.icr_lines = icr_lines
+        self.icr_points = icr_points
 
 
 class AnimatedRobot(object):
-    def __init__(self, ax: Axes):
+    def __init__(self, ax: Axes, icr_count: int):
         self.robot_body: Line2D = ax.plot([], [], color=body_colors[0])[0]
         self.wheels: List[Line2D] = [
-            ax.plot([], [], color=drive_module_colors[0])[0],
-            ax.plot([], [], color=drive_module_colors[1])[0],
-            ax.plot([], [], color=drive_module_colors[2])[0],
-            ax.plot([], [], color=drive_module_colors[3])[0],
-        ]
-        self.icr_lines: List[Line2D] = [
-            ax.plot(
-                [],
-                [],
-                color=drive_module_colors[0],
-                dashes=[10, 5, 10, 5],
-                linewidth=0.75,
-            )[0],
-            ax.plot(
-                [],
-                [],
-                color=drive_module_colors[0],
-                dashes=[10, 5, 10, 5],
-                linewidth=0.75,
-            )[0],
-            ax.plot(
-                [],
-                [],
-                color=drive_module_colors[1],
-                dashes=[10, 5, 10, 5],
-                linewidth=0.75,
-            )[0],
-            ax.plot(
-                [],
-                [],
-                color=drive_module_colors[1],
-                dashes=[10, 5, 10, 5],
-                linewidth=0.75,
-            )[0],
-            ax.plot(
-                [],
-                [],
-                color=drive_module_colors[2],
-                dashes=[10, 5, 10, 5],
-                linewidth=0.75,
-            )[0],
-            ax.plot(
-                [],
-                [],
-                color=drive_module_colors[2],
-                dashes=[10, 5, 10, 5],
-                linewidth=0.75,
-            )[0],
-            ax.plot(
-                [],
-                [],
-                color=drive_module_colors[3],
-                dashes=[10, 5, 10, 5],
-                linewidth=0.75,
-            )[0],
-            ax.plot(
-                [],
-                [],
-                color=drive_module_colors[3],
-                dashes=[10, 5, 10, 5],
-                linewidth=0.75,
-            )[0],
+            ax.plot([], [], color=color)[0] for color in drive_module_colors
         ]
+
+        # The two ICR lines of each drive module are drawn as a single collection
+        self.icr_lines: LineCollection = LineCollection(
+            [],
+            colors=[color for color in drive_module_colors for _ in range(2)],
+            linestyles=[(0, (10, 5, 10, 5))],
+            linewidths=0.75,
+        )
+        ax.add_collection(self.icr_lines, autolim=False)
+
         self.icr_points: List[Line2D] = [
-            ax.plot([], [], "-ro")[0],
-            ax.plot([], [], "-ro")[0],
-            ax.plot([], [], "-ro")[0],
-            ax.plot([], [], "-ro")[0],
-            ax.plot([], [], "-ro")[0],
-            ax.plot([], [], "-ro")[0],
+            ax.plot([], [], "-ro")[0] for _ in range(icr_count)
         ]
+
+        # The coordinates the ICR points were last drawn at. These start out as NaN so that all
+        # the points that are drawn are updated on the first frame.
+        self.icr_point_coordinates: np.ndarray = np.full(
+            (len(self.icr_points), 2), np.nan
+        )
+
         self.position: Line2D = ax.plot([], [], marker="*", markersize=2)[0]
 
+        # The artists never change once they are created, so the list of artists that is
+        # handed back to the animation on every frame can be built once.
+        self.all_artists: List[Artist] = (
+            [self.robot_body]
+            + self.wheels
+            + [self.icr_lines]
+            + self.icr_points
+            + [self.position]
+        )
+
 
 class AnimatedPlots(object):
     def __init__(
@@ -158,7 +159,10 @@ class AnimatedPlots(object):
         module_acceleration: Axes,
         module_jerk: Axes,
         drive_modules: List[DriveModule],
+        plots_enabled: AbstractSet[str],
     ):
+        self.plots_enabled = frozenset(plots_enabled)
+
         self.ax_body_velocity = body_velocity
         self.ax_body_acceleration = body_acceleration
         self.ax_body_jerk = body_jerk
@@ -175,108 +179,148 @@ class AnimatedPlots(object):
         self.ax_module_acceleration = module_acceleration
         self.ax_module_jerk = module_jerk
 
-        (self.body_x_velocity,) = body_velocity.plot(
-            [], [], lw=2.5, color=body_colors[1], label="x-velocity"
-        )
-        (self.body_y_velocity,) = body_velocity.plot(
-            [], [], lw=2.5, color=body_colors[2], label="y-velocity"
-        )
-
-        (self.body_x_acceleration,) = body_acceleration.plot(
-            [], [], lw=2.5, color=body_colors[1], label="x-acceleration"
-        )
-        (self.body_y_acceleration,) = body_acceleration.plot(
-            [], [], lw=2.5, color=body_colors[2], label="y-acceleration"
-        )
-
-        (self.body_x_jerk,) = body_jerk.plot(
-            [], [], lw=2.5, color=body_colors[1], label="x-jerk"
-        )
-        (self.body_y_jerk,) = body_jerk.plot(
-            [], [], lw=2.5, color=body_colors[2], label="y-jerk"
-        )
-
-        (self.body_angular_velocity,) = body_angular_velocity.plot(
-            [], [], lw=2.5, color=body_colors[0], label="rotation-velocity"
-        )
-        (self.body_angular_acceleration,) = body_angular_acceleration.plot(
-            [], [], lw=2.5, color=body_colors[0], label="rotation-acceleration"
-        )
-        (self.body_angular_jerk,) = body_angular_jerk.plot(
-            [], [], lw=2.5, color=body_colors[0], label="rotation-jerk"
-        )
+        self.body_x_velocity: Line2D = None
+        self.body_y_velocity: Line2D = None
+        if "body_velocity" in plots_enabled:
+            (self.body_x_velocity,) = body_velocity.plot(
+                [], [], lw=2.5, color=body_colors[1], label="x-velocity"
+            )
+            (self.body_y_velocity,) = body_velocity.plot(
+                [], [], lw=2.5, color=body_colors[2], label="y-velocity"
+            )
 
-        self.module_orientation: List[Line2D] = []
-        self.module_orientation_velocity: List[Line2D] = []
-        self.module_orientation_acceleration: List[Line2D] = []
-        self.module_orientation_jerk: List[Line2D] = []
-        self.module_velocity: List[Line2D] = []
-        self.module_acceleration: List[Line2D] = []
-        self.module_jerk: List[Line2D] = []
-
-        i: int = 0
-        for drive_module in drive_modules:
-            name = drive_module.name
-            color_name = drive_module_colors[i]
-
-            self.module_orientation.append(
-                module_orientation.plot(
-                    [0.0], [0.1], lw=2.5, color=color_name, label=name
-                )[0]
+        self.body_x_acceleration: Line2D = None
+        self.body_y_acceleration: Line2D = None
+        if "body_acceleration" in plots_enabled:
+            (self.body_x_acceleration,) = body_acceleration.plot(
+                [], [], lw=2.5, color=body_colors[1], label="x-acceleration"
             )
-            self.module_orientation_velocity.append(
-                module_orientation_velocity.plot(
-                    [], [], lw=2.5, color=color_name, label=name
-                )[0]
+            (self.body_y_acceleration,) = body_acceleration.plot(
+                [], [], lw=2.5, color=body_colors[2], label="y-acceleration"
             )
-            self.module_orientation_acceleration.append(
-                module_orientation_acceleration.plot(
-                    [], [], lw=2.5, color=color_name, label=name
-                )[0]
+
+        self.body_x_jerk: Line2D = None
+        self.body_y_jerk: Line2D = None
+        if "body_jerk" in plots_enabled:
+            (self.body_x_jerk,) = body_jerk.plot(
+                [], [], lw=2.5, color=body_colors[1], label="x-jerk"
             )
-            self.module_orientation_jerk.append(
-                module_orientation_jerk.plot(
-                    [], [], lw=2.5, color=color_name, label=name
-                )[0]
+            (self.body_y_jerk,) = body_jerk.plot(
+                [], [], lw=2.5, color=body_colors[2], label="y-jerk"
             )
 
-            self.module_velocity.append(
-                module_velocity.plot([], [], lw=2.5, color=color_name, label=name)[0]
+        self.body_angular_velocity: Line2D = None
+        if "body_angular_velocity" in plots_enabled:
+            (self.body_angular_velocity,) = body_angular_velocity.plot(
+                [], [], lw=2.5, color=body_colors[0], label="rotation-velocity"
             )
-            self.module_acceleration.append(
-                module_acceleration.plot([], [], lw=2.5, color=color_name, label=name)[
-                    0
-                ]
+
+        self.body_angular_acceleration: Line2D = None
+        if "body_angular_acceleration" in plots_enabled:
+            (self.body_angular_acceleration,) = body_angular_acceleration.plot(
+                [], [], lw=2.5, color=body_colors[0], label="rotation-acceleration"
             )
-            self.module_jerk.append(
-                module_jerk.plot([], [], lw=2.5, color=color_name, label=name)[0]
+
+        self.body_angular_jerk: Line2D = None
+        if "body_angular_jerk" in plots_enabled:
+            (self.body_angular_jerk,) = body_angular_jerk.plot(
+                [], [], lw=2.5, color=body_colors[0], label="rotation-jerk"
             )
 
-            i += 1
+        # The drive module graphs draw one line per drive module. All the lines in a graph are drawn
+        # as a single collection, so the legends use stand-in lines for the drive modules.
+        self.module_legend_lines: List[Line2D] = [
+            Line2D(
+                [],
+                [],
+                lw=2.5,
+                color=drive_module_colors[index],
+                label=drive_module.name,
+            )
+            for index, drive_module in enumerate(drive_modules)
+        ]
+
+        module_axes: List[Tuple[str, Axes]] = [
+            ("module_orientation", module_orientation),
+            ("module_orientation_velocity", module_orientation_velocity),
+            ("module_orientation_acceleration", module_orientation_acceleration),
+            ("module_orientation_jerk", module_orientation_jerk),
+            ("module_velocity", module_velocity),
+            ("module_acceleration", module_acceleration),
+            ("module_jerk", module_jerk),
+        ]
+        module_colors = drive_module_colors[: len(drive_modules)]
+        self.module_graphs: Dict[str, LineCollection] = {
+            name: create_module_graph_lines(ax, module_colors)
+            for name, ax in module_axes
+            if name in plots_enabled
+        }
+
+        # The artists never change once they are created, so the list of artists that is
+        # handed back to the animation on every frame can be built once.
+        body_artists: List[Line2D] = [
+            self.body_x_velocity,
+            self.body_y_velocity,
+            self.body_x_acceleration,
+            self.body_y_acceleration,
+            self.body_x_jerk,
+            self.body_y_jerk,
+            self.body_angular_velocity,
+            self.body_angular_acceleration,
+            self.body_angular_jerk,
+        ]
+        self.all_artists: List[Artist] = [
+            artist for artist in body_artists if artist is not None
+        ] + list(self.module_graphs.values())
 
     def legend_refresh(self):
-        self.ax_body_velocity.legend(loc="upper right")
-        self.ax_body_acceleration.legend(loc="upper right")
-        self.ax_body_jerk.legend(loc="upper right")
-        self.ax_body_angular_velocity.legend(loc="upper right")
-        self.ax_body_angular_acceleration.legend(loc="upper right")
-        self.ax_body_angular_jerk.legend(loc="upper right")
-        self.ax_module_orientation.legend(loc="upper right")
-        self.ax_module_orientation_velocity.legend(loc="upper right")
-        self.ax_module_orientation_acceleration.legend(loc="upper right")
-        self.ax_module_orientation_jerk.legend(loc="upper right")
-        self.ax_module_velocity.legend(loc="upper right")
-        self.ax_module_acceleration.legend(loc="upper right")
-        self.ax_module_jerk.legend(loc="upper right")
+        axes: List[Tuple[str, Axes]] = [
+            ("body_velocity", self.ax_body_velocity),
+            ("body_acceleration", self.ax_body_acceleration),
+            ("body_jerk", self.ax_body_jerk),
+            ("body_angular_velocity", self.ax_body_angular_velocity),
+            ("body_angular_acceleration", self.ax_body_angular_acceleration),
+            ("body_angular_jerk", self.ax_body_angular_jerk),
+            ("module_orientation", self.ax_module_orientation),
+            ("module_orientation_velocity", self.ax_module_orientation_velocity),
+            (
+                "module_orientation_acceleration",
+                self.ax_module_orientation_acceleration,
+            ),
+            ("module_orientation_jerk", self.ax_module_orientation_jerk),
+            ("module_velocity", self.ax_module_velocity),
+            ("module_acceleration", self.ax_module_acceleration),
+            ("module_jerk", self.ax_module_jerk),
+        ]
+        for name, ax in axes:
+            if name in self.module_graphs:
+                ax.legend(handles=self.module_legend_lines, loc="upper right")
+            elif name in self.plots_enabled:
+                ax.legend(loc="upper right")
 
 
 ANIMATION_FRAME_DIVIDER: int = 1
 PLOT_TITLE_FONT_SIZE: int = 10
 PLOT_AXIS_FONT_SIZE: int = 8
 
-animation_data: AnimationData = None
-animated_robot: AnimatedRobot = None
-animated_plots: AnimatedPlots = None
+# The names of the graphs that can be drawn next to the robot motion plot
+ALL_PLOTS: FrozenSet[str] = frozenset(
+    {
+        "body_velocity",
+        "body_acceleration",
+        "body_jerk",
+        "body_angular_velocity",
+        "body_angular_acceleration",
+        "body_angular_jerk",
+        "module_orientation",
+        "module_orientation_velocity",
+        "module_orientation_acceleration",
+        "module_orientation_jerk",
+        "module_velocity",
+        "module_acceleration",
+        "module_jerk",
+    }
+)
 
 body_colors: List[str] = [
     "orchid",
@@ -290,648 +334,43 @@ drive_module_colors: List[str] = ["darkorange", "green", "blue", "purple"]
 icr_colors: List[str] = ["orange", "lightgreen", "lightblue", "violet"]
 
 
-def animate(time_index: int) -> List[Line2D]:
-    drive_modules = animation_data.drive_modules
-    body_states = animation_data.body_states
-    drive_module_states = animation_data.drive_module_states
-    icr_coordinate_map = animation_data.icr_coordinate_map
-    current_time = animation_data.points_in_time[time_index * ANIMATION_FRAME_DIVIDER]
-
-    frames: List[Line2D] = []
+def animate(
+    time_index: int,
+    animation_data: AnimationData,
+    animated_robot: AnimatedRobot,
+    animated_plots: AnimatedPlots,
+) -> List[Artist]:
+    frames: List[Artist] = []
 
     robot_frames = create_robot_movement_frame(
-        drive_modules,
-        body_states[time_index * ANIMATION_FRAME_DIVIDER],
-        drive_module_states[time_index * ANIMATION_FRAME_DIVIDER],
-        icr_coordinate_map[time_index * ANIMATION_FRAME_DIVIDER],
+        animated_robot,
+        time_index,
+        animation_data.body_positions,
+        animation_data.body_outlines[time_index],
+        animation_data.wheels[time_index],
+        animation_data.icr_lines[time_index],
+        animation_data.icr_points[time_index],
     )
     frames.extend(robot_frames)
 
     graph_frames = create_graph_frames(
-        current_time,
-        drive_modules,
-        body_states[time_index * ANIMATION_FRAME_DIVIDER],
-        drive_module_states[time_index * ANIMATION_FRAME_DIVIDER],
+        animated_plots,
+        time_index,
+        animation_data.points_in_time,
+        animation_data.graph_values,
+        animation_data.module_graph_points,
     )
     frames.extend(graph_frames)
 
     return frames
 
 
-def create_body_acceleration_plot(
-    body_states: List[BodyState], fig: Figure, grid: GridSpec, time_max: float
-) -> Axes:
-    ax = fig.add_subplot(grid[0, 12:16])  ####
-
-    y_max: float = -100
-    y_min: float = 100
-    for state in body_states:
-        if state.motion_in_body_coordinates.linear_acceleration.x < y_min:
-            y_min = state.motion_in_body_coordinates.linear_acceleration.x
-
-        if state.motion_in_body_coordinates.linear_acceleration.y < y_min:
-            y_min = state.motion_in_body_coordinates.linear_acceleration.y
-
-        if state.motion_in_body_coordinates.linear_acceleration.x > y_max:
-            y_max = state.motion_in_body_coordinates.linear_acceleration.x
-
-        if state.motion_in_body_coordinates.linear_acceleration.y > y_max:
-            y_max = state.motion_in_body_coordinates.linear_acceleration.y
-
-    ax.set_ylim(y_min - 0.5, y_max + 0.5)
-    ax.set_xlim(0.0, time_max)
-
-    ax.set_title("Body acceleration", fontsize=PLOT_TITLE_FONT_SIZE)
-    ax.set_xlabel("Time (s)", fontsize=PLOT_AXIS_FONT_SIZE)
-    ax.set_ylabel("Acceleration (m/s^2)", fontsize=PLOT_AXIS_FONT_SIZE)
-
-    ax.grid(linestyle="--", linewidth=0.5, color=".25", zorder=-10)
-
-    return ax
-
-
-def create_body_jerk_plot(
-    body_states: List[BodyState], fig: Figure, grid: GridSpec, time_max: float
-) -> Axes:
-    ax = fig.add_subplot(grid[0, 16:20])  ####
-
-    y_max: float = -100
-    y_min: float = 100
-    for state in body_states:
-        if state.motion_in_body_coordinates.linear_jerk.x < y_min:
-            y_min = state.motion_in_body_coordinates.linear_jerk.x
-
-        if state.motion_in_body_coordinates.linear_jerk.y < y_min:
-            y_min = state.motion_in_body_coordinates.linear_jerk.y
-
-        if state.motion_in_body_coordinates.linear_jerk.x > y_max:
-            y_max = state.motion_in_body_coordinates.linear_jerk.x
-
-        if state.motion_in_body_coordinates.linear_jerk.y > y_max:
-            y_max = state.motion_in_body_coordinates.linear_jerk.y
-
-    ax.set_ylim(y_min - 0.5, y_max + 0.5)
-    ax.set_xlim(0.0, time_max)
-
-    ax.set_title("Body jerk", fontsize=PLOT_TITLE_FONT_SIZE)
-    ax.set_xlabel("Time (s)", fontsize=PLOT_AXIS_FONT_SIZE)
-    ax.set_ylabel("Jerk (m/s^3)", fontsize=PLOT_AXIS_FONT_SIZE)
-
-    ax.grid(linestyle="--", linewidth=0.5, color=".25", zorder=-10)
-
-    return ax
-
-
-def create_body_angular_acceleration_plot(
-    body_states: List[BodyState], fig: Figure, grid: GridSpec, time_max: float
-) -> Axes:
-    ax = fig.add_subplot(grid[1, 12:16])
-
-    y_max: float = -100
-    y_min: float = 100
-    for state in body_states:
-        if state.motion_in_body_coordinates.angular_acceleration.z < y_min:
-            y_min = state.motion_in_body_coordinates.angular_acceleration.z
-
-        if state.motion_in_body_coordinates.angular_acceleration.z > y_max:
-            y_max = state.motion_in_body_coordinates.angular_acceleration.z
-
-    ax.set_ylim(y_min - 0.5, y_max + 0.5)
-    ax.set_xlim(0.0, time_max)
-
-    ax.set_title("Body rotation acceleration", fontsize=PLOT_TITLE_FONT_SIZE)
-    ax.set_xlabel("Time (s)", fontsize=PLOT_AXIS_FONT_SIZE)
-    ax.set_ylabel("Acceleration (rad/s^2)", fontsize=PLOT_AXIS_FONT_SIZE)
-
-    ax.grid(linestyle="--", linewidth=0.5, color=".25", zorder=-10)
-
-    return ax
-
-
-def create_body_angular_jerk_plot(
-    body_states: List[BodyState], fig: Figure, grid: GridSpec, time_max: float
-) -> Axes:
-    ax = fig.add_subplot(grid[1, 16:20])  ####
-
-    y_max: float = -100
-    y_min: float = 100
-    for state in body_states:
-        if state.motion_in_body_coordinates.angular_jerk.z < y_min:
-            y_min = state.motion_in_body_coordinates.angular_jerk.z
-
-        if state.motion_in_body_coordinates.angular_jerk.z > y_max:
-            y_max = state.motion_in_body_coordinates.angular_jerk.z
-
-    ax.set_ylim(y_min - 0.5, y_max + 0.5)
-    ax.set_xlim(0.0, time_max)
-
-    ax.set_title("Body rotation jerk", fontsize=PLOT_TITLE_FONT_SIZE)
-    ax.set_xlabel("Time (s)", fontsize=PLOT_AXIS_FONT_SIZE)
-    ax.set_ylabel("Jerk (rad/s^3)", fontsize=PLOT_AXIS_FONT_SIZE)
-
-    ax.grid(linestyle="--", linewidth=0.5, color=".25", zorder=-10)
-
-    return ax
-
-
-def create_body_angular_velocity_plot(
-    body_states: List[BodyState], fig: Figure, grid: GridSpec, time_max: float
-) -> Axes:
-    ax = fig.add_subplot(grid[1, 8:12])
-
-    y_max: float = -100
-    y_min: float = 100
-    for state in body_states:
-        if state.motion_in_body_coordinates.angular_velocity.z < y_min:
-            y_min = state.motion_in_body_coordinates.angular_velocity.z
-
-        if state.motion_in_body_coordinates.angular_velocity.z > y_max:
-            y_max = state.motion_in_body_coordinates.angular_velocity.z
-
-    ax.set_ylim(y_min - 0.5, y_max + 0.5)
-    ax.set_xlim(0.0, time_max)
-
-    ax.set_title("Body angular velocity", fontsize=PLOT_TITLE_FONT_SIZE)
-    ax.set_xlabel("Time (s)", fontsize=PLOT_AXIS_FONT_SIZE)
-    ax.set_ylabel("Velocity (rad/s)", fontsize=PLOT_AXIS_FONT_SIZE)
-
-    ax.grid(linestyle="--", linewidth=0.5, color=".25", zorder=-10)
-
-    return ax
-
-
-def create_body_velocity_plot(
-    body_states: List[BodyState], fig: Figure, grid: GridSpec, time_max: float
-) -> Axes:
-    ax = fig.add_subplot(grid[0, 8:12])
-
-    y_max: float = -100
-    y_min: float = 100
-    for state in body_states:
-        if state.motion_in_body_coordinates.linear_velocity.x < y_min:
-            y_min = state.motion_in_body_coordinates.linear_velocity.x
-
-        if state.motion_in_body_coordinates.linear_velocity.y < y_min:
-            y_min = state.motion_in_body_coordinates.linear_velocity.y
-
-        if state.motion_in_body_coordinates.linear_velocity.x > y_max:
-            y_max = state.motion_in_body_coordinates.linear_velocity.x
-
-        if state.motion_in_body_coordinates.linear_velocity.y > y_max:
-            y_max = state.motion_in_body_coordinates.linear_velocity.y
-
-    ax.set_ylim(y_min - 0.5, y_max + 0.5)
-    ax.set_xlim(0.0, time_max)
-
-    ax.set_title("Body velocity", fontsize=PLOT_TITLE_FONT_SIZE)
-    ax.set_xlabel("Time (s)", fontsize=PLOT_AXIS_FONT_SIZE)
-    ax.set_ylabel("Velocity (m/s)", fontsize=PLOT_AXIS_FONT_SIZE)
-
-    ax.grid(linestyle="--", linewidth=0.5, color=".25", zorder=-10)
-
-    return ax
-
-
-def create_graph_frames(
-    current_time: float,
-    drive_modules: List[DriveModule],
-    body_state: BodyState,
-    drive_module_states: List[DriveModuleMeasuredValues],
-) -> List[Line2D]:  # pragma: no cover
-    plots: List[Line2D] = []
-
-    # Body x-velocity
-    data = animated_plots.body_x_velocity.get_data()
-    times: List[float] = list(data[0])
-    times.append(current_time)
-
-    velocities: List[float] = list(data[1])
-    velocities.append(body_state.motion_in_body_coordinates.linear_velocity.x)
-
-    animated_plots.body_x_velocity.set_data(times, velocities)
-    plots.append(animated_plots.body_x_velocity)
-
-    # Body y-velocity
-    data = animated_plots.body_y_velocity.get_data()
-    times: List[float] = list(data[0])
-    times.append(current_time)
-
-    velocities: List[float] = list(data[1])
-    velocities.append(body_state.motion_in_body_coordinates.linear_velocity.y)
-
-    animated_plots.body_y_velocity.set_data(times, velocities)
-    plots.append(animated_plots.body_y_velocity)
-
-    # Body x-acceleration
-    data = animated_plots.body_x_acceleration.get_data()
-    times: List[float] = list(data[0])
-    times.append(current_time)
-
-    accelerations: List[float] = list(data[1])
-    accelerations.append(body_state.motion_in_body_coordinates.linear_acceleration.x)
-
-    animated_plots.body_x_acceleration.set_data(times, accelerations)
-    plots.append(animated_plots.body_x_acceleration)
-
-    # Body y-acceleration
-    data = animated_plots.body_y_acceleration.get_data()
-    times: List[float] = list(data[0])
-    times.append(current_time)
-
-    accelerations: List[float] = list(data[1])
-    accelerations.append(body_state.motion_in_body_coordinates.linear_acceleration.y)
-
-    animated_plots.body_y_acceleration.set_data(times, accelerations)
-    plots.append(animated_plots.body_y_acceleration)
-
-    # Body x-jerk
-    data = animated_plots.body_x_jerk.get_data()
-    times: List[float] = list(data[0])
-    times.append(current_time)
-
-    jerk: List[float] = list(data[1])
-    jerk.append(body_state.motion_in_body_coordinates.linear_jerk.x)
-
-    animated_plots.body_x_jerk.set_data(times, jerk)
-    plots.append(animated_plots.body_x_jerk)
-
-    # Body y-jerk
-    data = animated_plots.body_y_jerk.get_data()
-    times: List[float] = list(data[0])
-    times.append(current_time)
-
-    jerk: List[float] = list(data[1])
-    jerk.append(body_state.motion_in_body_coordinates.linear_jerk.y)
-
-    animated_plots.body_y_jerk.set_data(times, jerk)
-    plots.append(animated_plots.body_y_jerk)
-
-    # body angular velocity
-    data = animated_plots.body_angular_velocity.get_data()
-    times: List[float] = list(data[0])
-    times.append(current_time)
-
-    velocities: List[float] = list(data[1])
-    velocities.append(body_state.motion_in_body_coordinates.angular_velocity.z)
-
-    animated_plots.body_angular_velocity.set_data(times, velocities)
-    plots.append(animated_plots.body_angular_velocity)
-
-    # body angular acceleration
-    data = animated_plots.body_angular_acceleration.get_data()
-    times: List[float] = list(data[0])
-    times.append(current_time)
-
-    accelerations: List[float] = list(data[1])
-    accelerations.append(body_state.motion_in_body_coordinates.angular_acceleration.z)
-
-    animated_plots.body_angular_acceleration.set_data(times, accelerations)
-    plots.append(animated_plots.body_angular_acceleration)
-
-    # body angular jerk
-    data = animated_plots.body_angular_jerk.get_data()
-    times: List[float] = list(data[0])
-    times.append(current_time)
-
-    jerk: List[float] = list(data[1])
-    jerk.append(body_state.motion_in_body_coordinates.angular_jerk.z)
-
-    animated_plots.body_angular_jerk.set_data(times, jerk)
-    plots.append(animated_plots.body_angular_jerk)
-
-    for i in range(len(drive_modules)):
-        state = drive_module_states[i]
-
-        # module orientation
-        data = animated_plots.module_orientation[i].get_data()
-        times: List[float] = list(data[0])
-        times.append(current_time)
-
-        orientations: List[float] = list(data[1])
-
-        orientations.append(state.orientation_in_body_coordinates.z)
-
-        animated_plots.module_orientation[i].set_data(times, orientations)
-
-        # module orientation velocity
-        data = animated_plots.module_orientation_velocity[i].get_data()
-        times: List[float] = list(data[0])
-        times.append(current_time)
-
-        orientation_velocities: List[float] = list(data[1])
-
-        orientation_velocities.append(state.orientation_velocity_in_body_coordinates.z)
-
-        animated_plots.module_orientation_velocity[i].set_data(
-            times, orientation_velocities
-        )
-
-        # module orientation acceleration
-        data = animated_plots.module_orientation_acceleration[i].get_data()
-        times: List[float] = list(data[0])
-        times.append(current_time)
-
-        orientation_accelerations: List[float] = list(data[1])
-
-        orientation_accelerations.append(
-            state.orientation_acceleration_in_body_coordinates.z
-        )
-
-        animated_plots.module_orientation_acceleration[i].set_data(
-            times, orientation_accelerations
-        )
-
-        # module orientation jerk
-        data = animated_plots.module_orientation_jerk[i].get_data()
-        times: List[float] = list(data[0])
-        times.append(current_time)
-
-        orientation_jerk: List[float] = list(data[1])
-
-        orientation_jerk.append(state.orientation_jerk_in_body_coordinates.z)
-
-        animated_plots.module_orientation_jerk[i].set_data(times, orientation_jerk)
-
-        # module velocity
-        data = animated_plots.module_velocity[i].get_data()
-        times: List[float] = list(data[0])
-        times.append(current_time)
-
-        velocities: List[float] = list(data[1])
-
-        velocities.append(state.drive_velocity_in_module_coordinates.x)
-
-        animated_plots.module_velocity[i].set_data(times, velocities)
-
-        # module acceleration
-        data = animated_plots.module_acceleration[i].get_data()
-        times: List[float] = list(data[0])
-        times.append(current_time)
-
-        accelerations: List[float] = list(data[1])
-
-        accelerations.append(state.drive_acceleration_in_module_coordinates.x)
-
-        animated_plots.module_acceleration[i].set_data(times, accelerations)
-
-        # module acceleration
-        data = animated_plots.module_jerk[i].get_data()
-        times: List[float] = list(data[0])
-        times.append(current_time)
-
-        jerk: List[float] = list(data[1])
-
-        jerk.append(state.drive_jerk_in_module_coordinates.x)
-
-        animated_plots.module_jerk[i].set_data(times, jerk)
-
-    plots.extend(animated_plots.module_orientation)
-    plots.extend(animated_plots.module_orientation_velocity)
-    plots.extend(animated_plots.module_orientation_acceleration)
-    plots.extend(animated_plots.module_orientation_jerk)
-    plots.extend(animated_plots.module_velocity)
-    plots.extend(animated_plots.module_acceleration)
-    plots.extend(animated_plots.module_jerk)
-
-    animated_plots.legend_refresh()
-
-    return plots
-
-
-def create_module_acceleration_plot(
-    drive_module_states: List[List[DriveModuleMeasuredValues]],
-    fig: Figure,
-    grid: GridSpec,
-    time_max: float,
-) -> Axes:
-    ax = fig.add_subplot(grid[2, 12:16])
-
-    y_max: float = -100
-    y_min: float = 100
-    for states in drive_module_states:
-        for state in states:
-            if state.drive_acceleration_in_module_coordinates.x < y_min:
-                y_min = state.drive_acceleration_in_module_coordinates.x
-
-            if state.drive_acceleration_in_module_coordinates.x > y_max:
-                y_max = state.drive_acceleration_in_module_coordinates.x
-
-    ax.set_ylim(y_min - 0.5, y_max + 0.5)
-    ax.set_xlim(0.0, time_max)
-
-    ax.set_title("Wheel acceleration", fontsize=PLOT_TITLE_FONT_SIZE)
-    ax.set_xlabel("Time (s)", fontsize=PLOT_AXIS_FONT_SIZE)
-    ax.set_ylabel("Acceleration (m/s^2)", fontsize=PLOT_AXIS_FONT_SIZE)
-
-    ax.grid(linestyle="--", linewidth=0.5, color=".25", zorder=-10)
-
-    return ax
-
-
-def create_module_jerk_plot(
-    drive_module_states: List[List[DriveModuleMeasuredValues]],
-    fig: Figure,
-    grid: GridSpec,
-    time_max: float,
-) -> Axes:
-    ax = fig.add_subplot(grid[2, 16:20])
-
-    y_max: float = -100
-    y_min: float = 100
-    for states in drive_module_states:
-        for state in states:
-            if state.drive_jerk_in_module_coordinates.x < y_min:
-                y_min = state.drive_jerk_in_module_coordinates.x
-
-            if state.drive_jerk_in_module_coordinates.x > y_max:
-                y_max = state.drive_jerk_in_module_coordinates.x
-
-    ax.set_ylim(y_min - 0.5, y_max + 0.5)
-    ax.set_xlim(0.0, time_max)
-
-    ax.set_title("Wheel jerk", fontsize=PLOT_TITLE_FONT_SIZE)
-    ax.set_xlabel("Time (s)", fontsize=PLOT_AXIS_FONT_SIZE)
-    ax.set_ylabel("Jerk (m/s^3)", fontsize=PLOT_AXIS_FONT_SIZE)
-
-    ax.grid(linestyle="--", linewidth=0.5, color=".25", zorder=-10)
-
-    return ax
-
-
-def create_module_orientation_acceleration_plot(
-    drive_module_states: List[List[DriveModuleMeasuredValues]],
-    fig: Figure,
-    grid: GridSpec,
-    time_max: float,
-) -> Axes:
-    ax = fig.add_subplot(grid[0, 2])
-
-    y_max: float = -100
-    y_min: float = 100
-    for states in drive_module_states:
-        for state in states:
-            if state.orientation_acceleration_in_body_coordinates.z < y_min:
-                y_min = state.orientation_acceleration_in_body_coordinates.z
-
-            if state.orientation_acceleration_in_body_coordinates.z > y_max:
-                y_max = state.orientation_acceleration_in_body_coordinates.z
-
-    ax.set_ylim(y_min - 0.5, y_max + 0.5)
-    ax.set_xlim(0.0, time_max)
-
-    ax.set_title("Steering angle acceleration", fontsize=PLOT_TITLE_FONT_SIZE)
-    ax.set_xlabel("Time (s)", fontsize=PLOT_AXIS_FONT_SIZE)
-    ax.set_ylabel("Acceleration (rad/s^2)", fontsize=PLOT_AXIS_FONT_SIZE)
-
-    ax.grid(linestyle="--", linewidth=0.5, color=".25", zorder=-10)
-
-    return ax
-
-
-def create_module_orientation_jerk_plot(
-    drive_module_states: List[List[DriveModuleMeasuredValues]],
-    fig: Figure,
-    grid: GridSpec,
-    time_max: float,
-) -> Axes:
-    ax = fig.add_subplot(grid[0, 3])
-
-    y_max: float = -100
-    y_min: float = 100
-    for states in drive_module_states:
-        for state in states:
-            if state.orientation_jerk_in_body_coordinates.z < y_min:
-                y_min = state.orientation_jerk_in_body_coordinates.z
-
-            if state.orientation_jerk_in_body_coordinates.z > y_max:
-                y_max = state.orientation_jerk_in_body_coordinates.z
-
-    ax.set_ylim(y_min - 0.5, y_max + 0.5)
-    ax.set_xlim(0.0, time_max)
-
-    ax.set_title("Steering angle jerk", fontsize=PLOT_TITLE_FONT_SIZE)
-    ax.set_xlabel("Time (s)", fontsize=PLOT_AXIS_FONT_SIZE)
-    ax.set_ylabel("Jerk (rad/s^3)", fontsize=PLOT_AXIS_FONT_SIZE)
-
-    ax.grid(linestyle="--", linewidth=0.5, color=".25", zorder=-10)
-
-    return ax
-
-
-def create_module_orientation_plot(
-    drive_module_states: List[List[DriveModuleMeasuredValues]],
-    fig: Figure,
-    grid: GridSpec,
-    time_max: float,
-) -> Axes:
-    ax = fig.add_subplot(grid[0, 0])
-
-    y_max: float = -100
-    y_min: float = 100
-    for states in drive_module_states:
-        for state in states:
-            if state.orientation_in_body_coordinates.z < y_min:
-                y_min = state.orientation_in_body_coordinates.z
-
-            if state.orientation_in_body_coordinates.z > y_max:
-                y_max = state.orientation_in_body_coordinates.z
-
-    ax.set_ylim(y_min - 0.5, y_max + 0.5)
-    ax.set_xlim(0.0, time_max)
-
-    ax.set_title("Steering angle", fontsize=PLOT_TITLE_FONT_SIZE)
-    ax.set_xlabel("Time (s)", fontsize=PLOT_AXIS_FONT_SIZE)
-    ax.set_ylabel("Orientation (rad)", fontsize=PLOT_AXIS_FONT_SIZE)
-
-    ax.grid(linestyle="--", linewidth=0.5, color=".25", zorder=-10)
-
-    return ax
-
-
-def create_module_orientation_velocity_plot(
-    drive_module_states: List[List[DriveModuleMeasuredValues]],
-    fig: Figure,
-    grid: GridSpec,
-    time_max: float,
-) -> Axes:
-    ax = fig.add_subplot(grid[0, 1])
-
-    y_max: float = -100
-    y_min: float = 100
-    for states in drive_module_states:
-        for state in states:
-            if state.orientation_velocity_in_body_coordinates.z < y_min:
-                y_min = state.orientation_velocity_in_body_coordinates.z
-
-            if state.orientation_velocity_in_body_coordinates.z > y_max:
-                y_max = state.orientation_velocity_in_body_coordinates.z
-
-    ax.set_ylim(y_min - 0.5, y_max + 0.5)
-    ax.set_xlim(0.0, time_max)
-
-    ax.set_title("Steering angle velocity", fontsize=PLOT_TITLE_FONT_SIZE)
-    ax.set_xlabel("Time (s)", fontsize=PLOT_AXIS_FONT_SIZE)
-    ax.set_ylabel("Velocity (rad/s)", fontsize=PLOT_AXIS_FONT_SIZE)
-
-    ax.grid(linestyle="--", linewidth=0.5, color=".25", zorder=-10)
-
-    return ax
-
-
-def create_module_velocity_plot(
-    drive_module_states: List[List[DriveModuleMeasuredValues]],
-    fig: Figure,
-    grid: GridSpec,
-    time_max: float,
-) -> Axes:
-    ax = fig.add_subplot(grid[2, 8:12])
-
-    y_max: float = -100
-    y_min: float = 100
-    for states in drive_module_states:
-        for state in states:
-            if state.drive_velocity_in_module_coordinates.x < y_min:
-                y_min = state.drive_velocity_in_module_coordinates.x
-
-            if state.drive_velocity_in_module_coordinates.x > y_max:
-                y_max = state.drive_velocity_in_module_coordinates.x
-
-    ax.set_ylim(y_min - 0.5, y_max + 0.5)
-    ax.set_xlim(0.0, time_max)
-
-    ax.set_title("Wheel velocity", fontsize=PLOT_TITLE_FONT_SIZE)
-    ax.set_xlabel("Time (s)", fontsize=PLOT_AXIS_FONT_SIZE)
-    ax.set_ylabel("Velocity (m/s)", fontsize=PLOT_AXIS_FONT_SIZE)
-
-    ax.grid(linestyle="--", linewidth=0.5, color=".25", zorder=-10)
-
-    return ax
-
-
-def create_robot_movement_frame(
-    drive_modules: List[DriveModule],
-    body_state: BodyState,
-    drive_module_states: List[DriveModuleMeasuredValues],
-    icr_coordinate_map: Tuple[
-        float, List[Tuple[DriveModuleMeasuredValues, DriveModuleMeasuredValues, Point]]
-    ],
-    wheel_color="-r",
-    truck_color="-k",
-) -> List[Line2D]:  # pragma: no cover
-    # Compute the rotation matrix for the body orientation
-    body_rotation_matrix = np.array(
-        [
-            [
-                math.cos(body_state.orientation_in_world_coordinates.z),
-                math.sin(body_state.orientation_in_world_coordinates.z),
-            ],
-            [
-                -math.sin(body_state.orientation_in_world_coordinates.z),
-                math.cos(body_state.orientation_in_world_coordinates.z),
-            ],
-        ]
-    )
-
+def create_body_outline_template(
+    drive_modules: List[DriveModule], steering_positions: np.ndarray
+) -> np.ndarray:
+    # Returns the (2, 5) outline of the robot body in body coordinates. This only depends on the
+    # drive modules so it is created once.
+    #
     # There is no layout for the robot body (because the calculations don't need it at the moment) so
     # the size of the body is based on the distances between the drive modules.
     # We assume that each drive module is on one of the corners of the robot body, e.g. like this
@@ -947,28 +386,22 @@ def create_robot_movement_frame(
     #       | |  |       |  | |
     #       ---  ---------  ---
     #
-    left_front_x: float = max(
-        (drive_module.steering_axis_xy_position.x + drive_module.wheel_radius)
-        for drive_module in drive_modules
-    )
-    left_front_y: float = max(
-        (
-            drive_module.steering_axis_xy_position.y
-            - (0.5 * drive_module.wheel_width + drive_module.wheel_radius)
-        )
-        for drive_module in drive_modules
-    )
-    right_rear_x: float = min(
-        (drive_module.steering_axis_xy_position.x - drive_module.wheel_radius)
-        for drive_module in drive_modules
+    wheel_radii = np.array(
+        [drive_module.wheel_radius for drive_module in drive_modules]
     )
-    right_rear_y: float = min(
-        (
-            drive_module.steering_axis_xy_position.x
-            + (0.5 * drive_module.wheel_width + drive_module.wheel_radius)
-        )
-        for drive_module in drive_modules
+    wheel_half_widths = 0.5 * np.array(
+        [drive_module.wheel_width for drive_module in drive_modules]
     )
+    steering_x = steering_positions[:, 0]
+
+    left_front_x: float = (steering_x + wheel_radii).max()
+    left_front_y: float = (
+        steering_positions[:, 1] - (wheel_half_widths + wheel_radii)
+    ).max()
+    right_rear_x: float = (steering_x - wheel_radii).min()
+    right_rear_y: float = (
+        steering_positions[:, 1] + (wheel_half_widths + wheel_radii)
+    ).min()
 
     # The outline is one array of x-coordinates starting at the left-front, going counter clock-wise, and ending at the left-front, and
     # one array of y-coordinates
@@ -979,37 +412,20 @@ def create_robot_movement_frame(
         ]
     )
 
-    # Rotate the body to the correct orientation
-    body_outline = (body_outline.T.dot(body_rotation_matrix)).T
+    return body_outline
 
-    # Translate the body to the position
-    body_outline[0, :] += body_state.position_in_world_coordinates.x
-    body_outline[1, :] += body_state.position_in_world_coordinates.y
 
+def create_drive_module_templates(
+    drive_modules: List[DriveModule],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Returns the outlines of the wheels and ICR lines in drive module coordinates, and the positions
+    # of the steering axes in body coordinates. These only depend on the drive modules so they are
+    # created once.
     #
-    # DRIVE MODULES
-    #
-
-    wheels: List[np.array] = []
-    icrs: List[np.array] = []
-    for i in range(len(drive_modules)):
-        drive_module = drive_modules[i]
-        drive_module_state = drive_module_states[i]
-
-        drive_module_rotation_matrix = np.array(
-            [
-                [
-                    math.cos(drive_module_state.orientation_in_body_coordinates.z),
-                    math.sin(drive_module_state.orientation_in_body_coordinates.z),
-                ],
-                [
-                    -math.sin(drive_module_state.orientation_in_body_coordinates.z),
-                    math.cos(drive_module_state.orientation_in_body_coordinates.z),
-                ],
-            ]
-        )
-
-        wheel = np.array(
+    # The arrays have the shapes (N, 2, 5), (2 * N, 2, 2) and (N, 2), where N is the number of drive
+    # modules.
+    wheel_templates = np.array(
+        [
             [
                 # x-coordinates of the corners of the shape, starting on the top left, moving counter-clockwise
                 [
@@ -1028,119 +444,248 @@ def create_robot_movement_frame(
                     0.5 * drive_module.wheel_width,
                 ],
             ]
+            for drive_module in drive_modules
+        ]
+    )
+
+    # Two ICR lines per drive module, one on either side of the wheel
+    icr_line_templates = np.array(
+        [
+            [[0.0, 0.0], [0.5 * drive_module.wheel_width, direction * 25.0]]
+            for drive_module in drive_modules
+            for direction in (1.0, -1.0)
+        ]
+    )
+
+    steering_positions = np.array(
+        [
+            [
+                drive_module.steering_axis_xy_position.x,
+                drive_module.steering_axis_xy_position.y,
+            ]
+            for drive_module in drive_modules
+        ]
+    )
+
+    return wheel_templates, icr_line_templates, steering_positions
+
+
+def create_graph_frames(
+    animated_plots: AnimatedPlots,
+    time_index: int,
+    points_in_time: np.ndarray,
+    graph_values: GraphValues,
+    module_graph_points: Dict[str, np.ndarray],
+) -> List[Artist]:  # pragma: no cover
+    plots_enabled = animated_plots.plots_enabled
+
+    # The graphs show all the values up to and including the current frame. These are read straight
+    # from the precomputed arrays so nothing has to be accumulated from frame to frame.
+    point_count = time_index + 1
+    times = points_in_time[:point_count]
+
+    if "body_velocity" in plots_enabled:
+        velocities = graph_values.body_linear_velocities[:point_count]
+        animated_plots.body_x_velocity.set_data(times, velocities[:, 0])
+        animated_plots.body_y_velocity.set_data(times, velocities[:, 1])
+
+    if "body_acceleration" in plots_enabled:
+        accelerations = graph_values.body_linear_accelerations[:point_count]
+        animated_plots.body_x_acceleration.set_data(times, accelerations[:, 0])
+        animated_plots.body_y_acceleration.set_data(times, accelerations[:, 1])
+
+    if "body_jerk" in plots_enabled:
+        jerks = graph_values.body_linear_jerks[:point_count]
+        animated_plots.body_x_jerk.set_data(times, jerks[:, 0])
+        animated_plots.body_y_jerk.set_data(times, jerks[:, 1])
+
+    if "body_angular_velocity" in plots_enabled:
+        animated_plots.body_angular_velocity.set_data(
+            times, graph_values.body_angular_velocities[:point_count]
         )
 
-        icr_line_1 = np.array([[0.0, 0.0], [0.5 * drive_module.wheel_width, 25.0]])
+    if "body_angular_acceleration" in plots_enabled:
+        animated_plots.body_angular_acceleration.set_data(
+            times, graph_values.body_angular_accelerations[:point_count]
+        )
 
-        icr_line_2 = np.array([[0.0, 0.0], [0.5 * drive_module.wheel_width, -25.0]])
+    if "body_angular_jerk" in plots_enabled:
+        animated_plots.body_angular_jerk.set_data(
+            times, graph_values.body_angular_jerks[:point_count]
+        )
 
-        # Rotate the wheel to the drive module orientation
-        wheel = (wheel.T.dot(drive_module_rotation_matrix)).T
-        icr_line_1 = (icr_line_1.T.dot(drive_module_rotation_matrix)).T
-        icr_line_2 = (icr_line_2.T.dot(drive_module_rotation_matrix)).T
+    # The lines of all the drive modules in a graph are updated with a single call
+    for name, lines in animated_plots.module_graphs.items():
+        lines.set_segments(module_graph_points[name][:, :point_count])
 
-        # Translate the wheel to the body, with the body at (0, 0)
-        wheel[0, :] += drive_module.steering_axis_xy_position.x
-        wheel[1, :] += drive_module.steering_axis_xy_position.y
+    return animated_plots.all_artists
 
-        icr_line_1[0, :] += drive_module.steering_axis_xy_position.x
-        icr_line_1[1, :] += drive_module.steering_axis_xy_position.y
 
-        icr_line_2[0, :] += drive_module.steering_axis_xy_position.x
-        icr_line_2[1, :] += drive_module.steering_axis_xy_position.y
+def create_graph_plot(
+    values: np.ndarray,
+    fig: Figure,
+    grid_cell: SubplotSpec,
+    title: str,
+    y_label: str,
+    time_max: float,
+) -> Axes:
+    # Creates the axes for one of the graphs with the y-axis sized to fit all the values that will
+    # be drawn in it
+    ax = fig.add_subplot(grid_cell)
 
-        # Rotate the wheel to match the body orientation
-        wheel = (wheel.T.dot(body_rotation_matrix)).T
-        icr_line_1 = (icr_line_1.T.dot(body_rotation_matrix)).T
-        icr_line_2 = (icr_line_2.T.dot(body_rotation_matrix)).T
+    ax.set_ylim(values.min() - 0.5, values.max() + 0.5)
+    ax.set_xlim(0.0, time_max)
 
-        # Translate the wheel to the actual body coordinates
-        wheel[0, :] += body_state.position_in_world_coordinates.x
-        wheel[1, :] += body_state.position_in_world_coordinates.y
+    ax.set_title(title, fontsize=PLOT_TITLE_FONT_SIZE)
+    ax.set_xlabel("Time (s)", fontsize=PLOT_AXIS_FONT_SIZE)
+    ax.set_ylabel(y_label, fontsize=PLOT_AXIS_FONT_SIZE)
 
-        icr_line_1[0, :] += body_state.position_in_world_coordinates.x
-        icr_line_1[1, :] += body_state.position_in_world_coordinates.y
+    ax.grid(linestyle="--", linewidth=0.5, color=".25", zorder=-10)
 
-        icr_line_2[0, :] += body_state.position_in_world_coordinates.x
-        icr_line_2[1, :] += body_state.position_in_world_coordinates.y
+    return ax
+
+
+def create_graph_values(
+    body_states: List[BodyState],
+    drive_module_states: List[List[DriveModuleMeasuredValues]],
+) -> GraphValues:
+    # Walks the states once and copies all the values that are drawn in the graphs into arrays,
+    # with one row per point in time.
+    body_values = np.array(
+        [
+            [
+                motion.linear_velocity.x,
+                motion.linear_velocity.y,
+                motion.linear_acceleration.x,
+                motion.linear_acceleration.y,
+                motion.linear_jerk.x,
+                motion.linear_jerk.y,
+                motion.angular_velocity.z,
+                motion.angular_acceleration.z,
+                motion.angular_jerk.z,
+            ]
+            for motion in (state.motion_in_body_coordinates for state in body_states)
+        ],
+        dtype=np.float64,
+    )
 
-        # Store the wheel outline information
-        wheels.append(wheel)
-        icrs.append(icr_line_1)
-        icrs.append(icr_line_2)
+    module_values = np.array(
+        [
+            [
+                [
+                    state.orientation_in_body_coordinates.z,
+                    state.orientation_velocity_in_body_coordinates.z,
+                    state.orientation_acceleration_in_body_coordinates.z,
+                    state.orientation_jerk_in_body_coordinates.z,
+                    state.drive_velocity_in_module_coordinates.x,
+                    state.drive_acceleration_in_module_coordinates.x,
+                    state.drive_jerk_in_module_coordinates.x,
+                ]
+                for state in states
+            ]
+            for states in drive_module_states
+        ],
+        dtype=np.float64,
+    )
 
-    plots: List[Line2D] = []
-    animated_robot.robot_body.set_data(
-        np.array(body_outline[0, :]).flatten(), np.array(body_outline[1, :]).flatten()
+    return GraphValues(
+        body_values[:, 0:2],
+        body_values[:, 2:4],
+        body_values[:, 4:6],
+        body_values[:, 6],
+        body_values[:, 7],
+        body_values[:, 8],
+        module_values[:, :, 0],
+        module_values[:, :, 1],
+        module_values[:, :, 2],
+        module_values[:, :, 3],
+        module_values[:, :, 4],
+        module_values[:, :, 5],
+        module_values[:, :, 6],
     )
-    plots.append(animated_robot.robot_body)
 
-    for wheel_index in range(len(wheels)):
-        wheel = wheels[wheel_index]
-        animated_robot.wheels[wheel_index].set_data(
-            np.array(wheel[0, :]).flatten(), np.array(wheel[1, :]).flatten()
-        )
-        plots.append(animated_robot.wheels[wheel_index])
 
-    for icr_index in range(len(icrs)):
-        icr_line = icrs[icr_index]
-        animated_robot.icr_lines[icr_index].set_data(
-            np.array(icr_line[0, :]).flatten(), np.array(icr_line[1, :]).flatten()
-        )
-        plots.append(animated_robot.icr_lines[icr_index])
+def create_module_graph_lines(ax: Axes, colors: List[str]) -> LineCollection:
+    # Creates the collection that draws the lines of all the drive modules in one of the drive
+    # module graphs
+    lines = LineCollection(
+        [], linewidths=2.5, colors=colors, capstyle="projecting", joinstyle="round"
+    )
+    ax.add_collection(lines, autolim=False)
 
-    for icr_index in range(len(icr_coordinate_map[1])):
-        _, _, icr_coordinate = icr_coordinate_map[1][icr_index]
+    return lines
 
-        icr_point = np.array([[icr_coordinate.x], [icr_coordinate.y]])
-        icr_point = (icr_point.T.dot(body_rotation_matrix)).T
 
-        # Translate the wheel to the actual body coordinates
-        icr_point[0, :] += body_state.position_in_world_coordinates.x
-        icr_point[1, :] += body_state.position_in_world_coordinates.y
+def create_module_graph_points(
+    points_in_time: np.ndarray, values: np.ndarray
+) -> np.ndarray:
+    # Combines the points in time, (T,), with the drive module values, (T, N), into the (N, T, 2)
+    # array of (time, value) points of the line of each drive module
+    points = np.empty((values.shape[1], values.shape[0], 2), dtype=np.float64)
+    points[:, :, 0] = points_in_time
+    points[:, :, 1] = values.T
 
-        animated_robot.icr_points[icr_index].set_data(
-            np.array(icr_point[0, :]).flatten(), np.array(icr_point[1, :]).flatten()
-        )
-        plots.append(animated_robot.icr_points[icr_index])
+    return points
 
-    data = animated_robot.position.get_data()
-    x_coordinates: List[float] = list(data[0])
-    x_coordinates.append(body_state.position_in_world_coordinates.x)
 
-    y_coordinates: List[float] = list(data[1])
-    y_coordinates.append(body_state.position_in_world_coordinates.y)
+def create_robot_movement_frame(
+    animated_robot: AnimatedRobot,
+    frame_index: int,
+    body_positions: np.ndarray,
+    body_outline: np.ndarray,
+    wheels: np.ndarray,
+    icr_lines: np.ndarray,
+    icr_points: np.ndarray,
+) -> List[Artist]:  # pragma: no cover
+    animated_robot.robot_body.set_data(body_outline[0], body_outline[1])
 
-    animated_robot.position.set_data(x_coordinates, y_coordinates)
-    plots.append(animated_robot.position)
+    for wheel_index in range(len(wheels)):
+        wheel = wheels[wheel_index]
+        animated_robot.wheels[wheel_index].set_data(wheel[0], wheel[1])
+
+    animated_robot.icr_lines.set_segments(icr_lines)
+
+    # The ICR points often don't move between frames, e.g. when the robot is stationary or moving
+    # in a straight line, so only update the points that actually moved. Points that are NaN, i.e.
+    # not drawn, in both frames haven't moved either.
+    previous_icr_points = animated_robot.icr_point_coordinates
+    icr_points_moved = np.any(
+        (icr_points != previous_icr_points)
+        & ~(np.isnan(icr_points) & np.isnan(previous_icr_points)),
+        axis=1,
+    )
+    for icr_index in np.flatnonzero(icr_points_moved):
+        icr_point = icr_points[icr_index]
+        animated_robot.icr_points[icr_index].set_data(icr_point[0:1], icr_point[1:2])
+    animated_robot.icr_point_coordinates[:] = icr_points
+
+    # The trail of positions the robot body has been at up to and including the current frame
+    animated_robot.position.set_data(
+        body_positions[: frame_index + 1, 0],
+        body_positions[: frame_index + 1, 1],
+    )
 
-    return plots
+    return animated_robot.all_artists
 
 
 def create_robot_plot(
     body_states: List[BodyState], fig: Figure, grid: GridSpec
 ) -> Axes:
     ax = fig.add_subplot(grid[0:3, 0:8])
-    x_max: float = -100
-    x_min: float = 100
-
-    y_max: float = -100
-    y_min: float = 100
-    for state in body_states:
-        if state.position_in_world_coordinates.x < x_min:
-            x_min = state.position_in_world_coordinates.x
-
-        if state.position_in_world_coordinates.x > x_max:
-            x_max = state.position_in_world_coordinates.x
-
-        if state.position_in_world_coordinates.y < y_min:
-            y_min = state.position_in_world_coordinates.y
 
-        if state.position_in_world_coordinates.y > y_max:
-            y_max = state.position_in_world_coordinates.y
+    x_positions = np.fromiter(
+        (state.position_in_world_coordinates.x for state in body_states),
+        dtype=np.float64,
+        count=len(body_states),
+    )
+    y_positions = np.fromiter(
+        (state.position_in_world_coordinates.y for state in body_states),
+        dtype=np.float64,
+        count=len(body_states),
+    )
 
-    ax.set_ylim(y_min - 5, y_max + 5)
-    ax.set_xlim(x_min - 5, x_max + 5)
+    ax.set_ylim(y_positions.min() - 5, y_positions.max() + 5)
+    ax.set_xlim(x_positions.min() - 5, x_positions.max() + 5)
 
     ax.set_xlabel("x-position (m)", fontsize=PLOT_TITLE_FONT_SIZE)
     ax.set_ylabel("y-position (m)", fontsize=PLOT_AXIS_FONT_SIZE)
@@ -1163,6 +708,7 @@ def plot_movement_through_space(
         ]
     ],
     output_file_name_without_extension,
+    plots_enabled: AbstractSet[str] = ALL_PLOTS,
 ):
     fig = plt.figure(figsize=[25.0, 12.0], constrained_layout=True)
     # main_grid = fig.add_gridspec(4, 20)
@@ -1174,108 +720,366 @@ def plot_movement_through_space(
     # Image of moving robot
     ax_robot = create_robot_plot(body_states, fig, gs1)
 
-    # Robot body velocity and acceleration
-    time_max: float = points_in_time[-1]
-
-    ax_body_velocity = create_body_velocity_plot(body_states, fig, gs1, time_max)
-    ax_body_acceleration = create_body_acceleration_plot(
-        body_states, fig, gs1, time_max
-    )
-    ax_body_jerk = create_body_jerk_plot(body_states, fig, gs1, time_max)
+    # Copy the values that are drawn in the graphs out of the state objects once, so that all the
+    # graphs are set up from plain arrays.
+    graph_values = create_graph_values(body_states, drive_module_states)
 
-    ax_body_angular_velocity = create_body_angular_velocity_plot(
-        body_states, fig, gs1, time_max
+    # The graphs next to the robot, described by the name of the graph, the values that are drawn
+    # in it, the cell of the grid it is drawn in, its title and the label of its y-axis
+    graphs: List[Tuple[str, np.ndarray, SubplotSpec, str, str]] = [
+        (
+            "body_velocity",
+            graph_values.body_linear_velocities,
+            gs1[0, 8:12],
+            "Body velocity",
+            "Velocity (m/s)",
+        ),
+        (
+            "body_acceleration",
+            graph_values.body_linear_accelerations,
+            gs1[0, 12:16],
+            "Body acceleration",
+            "Acceleration (m/s^2)",
+        ),
+        (
+            "body_jerk",
+            graph_values.body_linear_jerks,
+            gs1[0, 16:20],
+            "Body jerk",
+            "Jerk (m/s^3)",
+        ),
+        (
+            "body_angular_velocity",
+            graph_values.body_angular_velocities,
+            gs1[1, 8:12],
+            "Body angular velocity",
+            "Velocity (rad/s)",
+        ),
+        (
+            "body_angular_acceleration",
+            graph_values.body_angular_accelerations,
+            gs1[1, 12:16],
+            "Body rotation acceleration",
+            "Acceleration (rad/s^2)",
+        ),
+        (
+            "body_angular_jerk",
+            graph_values.body_angular_jerks,
+            gs1[1, 16:20],
+            "Body rotation jerk",
+            "Jerk (rad/s^3)",
+        ),
+        (
+            "module_orientation",
+            graph_values.module_orientations,
+            gs2[0, 0],
+            "Steering angle",
+            "Orientation (rad)",
+        ),
+        (
+            "module_orientation_velocity",
+            graph_values.module_orientation_velocities,
+            gs2[0, 1],
+            "Steering angle velocity",
+            "Velocity (rad/s)",
+        ),
+        (
+            "module_orientation_acceleration",
+            graph_values.module_orientation_accelerations,
+            gs2[0, 2],
+            "Steering angle acceleration",
+            "Acceleration (rad/s^2)",
+        ),
+        (
+            "module_orientation_jerk",
+            graph_values.module_orientation_jerks,
+            gs2[0, 3],
+            "Steering angle jerk",
+            "Jerk (rad/s^3)",
+        ),
+        (
+            "module_velocity",
+            graph_values.module_velocities,
+            gs1[2, 8:12],
+            "Wheel velocity",
+            "Velocity (m/s)",
+        ),
+        (
+            "module_acceleration",
+            graph_values.module_accelerations,
+            gs1[2, 12:16],
+            "Wheel acceleration",
+            "Acceleration (m/s^2)",
+        ),
+        (
+            "module_jerk",
+            graph_values.module_jerks,
+            gs1[2, 16:20],
+            "Wheel jerk",
+            "Jerk (m/s^3)",
+        ),
+    ]
+
+    # Graphs that were not requested are not created so that they don't have to be updated on
+    # every frame.
+    time_max: float = points_in_time[-1]
+    graph_axes: Dict[str, Axes] = {
+        name: create_graph_plot(values, fig, grid_cell, title, y_label, time_max)
+        for name, values, grid_cell, title, y_label in graphs
+        if name in plots_enabled
+    }
+
+    # Only every ANIMATION_FRAME_DIVIDER-th state is drawn. Select those states once so that the
+    # robot frames are only computed for the states that are drawn and so that the animation
+    # frame index can be used to index the states directly.
+    frame_points_in_time = points_in_time[::ANIMATION_FRAME_DIVIDER]
+    frame_body_states = body_states[::ANIMATION_FRAME_DIVIDER]
+    frame_drive_module_states = drive_module_states[::ANIMATION_FRAME_DIVIDER]
+    frame_icr_coordinate_map = icr_coordinate_map[::ANIMATION_FRAME_DIVIDER]
+    frame_graph_values = graph_values.every_nth_point_in_time(ANIMATION_FRAME_DIVIDER)
+    frame_count = len(frame_points_in_time)
+
+    # Copy the values that are needed to draw the robot out of the state objects once, so that
+    # the robot frames are computed from, and the animation reads from, plain arrays.
+    body_positions = np.array(
+        [
+            [
+                state.position_in_world_coordinates.x,
+                state.position_in_world_coordinates.y,
+            ]
+            for state in frame_body_states
+        ]
     )
-    ax_body_angular_acceleration = create_body_angular_acceleration_plot(
-        body_states, fig, gs1, time_max
+    body_orientations = np.array(
+        [state.orientation_in_world_coordinates.z for state in frame_body_states]
     )
-    ax_body_angular_jerk = create_body_angular_jerk_plot(
-        body_states, fig, gs1, time_max
+    drive_module_orientations = np.array(
+        [
+            [state.orientation_in_body_coordinates.z for state in states]
+            for states in frame_drive_module_states
+        ]
     )
 
-    # Module orientation and orientation velocity
-    ax_module_orientation = create_module_orientation_plot(
-        drive_module_states, fig, gs2, time_max
-    )
-    ax_module_angular_velocity = create_module_orientation_velocity_plot(
-        drive_module_states, fig, gs2, time_max
-    )
-    ax_module_angular_acceleration = create_module_orientation_acceleration_plot(
-        drive_module_states, fig, gs2, time_max
-    )
-    ax_module_angular_jerk = create_module_orientation_jerk_plot(
-        drive_module_states, fig, gs2, time_max
-    )
+    # The ICR coordinates are stored as a (T, K, 2) array. Points in time that have fewer ICRs than
+    # the others are padded with NaN, which isn't drawn.
+    icr_count = max(len(icrs) for _, icrs in frame_icr_coordinate_map)
+    icr_coordinates = np.full((frame_count, icr_count, 2), np.nan)
+    for time_index, (_, icrs) in enumerate(frame_icr_coordinate_map):
+        if icrs:
+            icr_coordinates[time_index, : len(icrs)] = [
+                [icr_coordinate.x, icr_coordinate.y] for _, _, icr_coordinate in icrs
+            ]
 
-    # Module velocity and acceleration
-    ax_module_velocity = create_module_velocity_plot(
-        drive_module_states, fig, gs1, time_max
+    # The drive module graphs draw one line per drive module. The points of those lines are created
+    # once so that each frame only has to hand a slice of them to the graph.
+    frame_times = np.asarray(frame_points_in_time, dtype=np.float64)
+    module_graph_points: Dict[str, np.ndarray] = {
+        name: create_module_graph_points(frame_times, values)
+        for name, values in (
+            ("module_orientation", frame_graph_values.module_orientations),
+            (
+                "module_orientation_velocity",
+                frame_graph_values.module_orientation_velocities,
+            ),
+            (
+                "module_orientation_acceleration",
+                frame_graph_values.module_orientation_accelerations,
+            ),
+            ("module_orientation_jerk", frame_graph_values.module_orientation_jerks),
+            ("module_velocity", frame_graph_values.module_velocities),
+            ("module_acceleration", frame_graph_values.module_accelerations),
+            ("module_jerk", frame_graph_values.module_jerks),
+        )
+        if name in plots_enabled
+    }
+
+    wheel_templates, icr_line_templates, steering_positions = (
+        create_drive_module_templates(drive_modules)
+    )
+    body_outline_template = create_body_outline_template(
+        drive_modules, steering_positions
     )
-    ax_module_acceleration = create_module_acceleration_plot(
-        drive_module_states, fig, gs1, time_max
+    body_outlines, wheels, icr_lines, icr_points = precompute_robot_frames(
+        body_outline_template,
+        wheel_templates,
+        icr_line_templates,
+        steering_positions,
+        body_positions,
+        body_orientations,
+        drive_module_orientations,
+        icr_coordinates,
     )
-    ax_module_jerk = create_module_jerk_plot(drive_module_states, fig, gs1, time_max)
 
-    global animation_data
     animation_data = AnimationData(
-        ax_robot,
-        ax_body_velocity,
-        ax_body_acceleration,
-        ax_body_jerk,
-        ax_body_angular_velocity,
-        ax_body_angular_acceleration,
-        ax_body_angular_jerk,
-        ax_module_orientation,
-        ax_module_angular_velocity,
-        ax_module_velocity,
-        ax_module_acceleration,
-        points_in_time,
-        drive_modules,
-        body_states,
-        drive_module_states,
-        icr_coordinate_map,
+        points_in_time=frame_times,
+        graph_values=frame_graph_values,
+        module_graph_points=module_graph_points,
+        body_positions=body_positions,
+        body_outlines=body_outlines,
+        wheels=wheels,
+        icr_lines=icr_lines,
+        icr_points=icr_points,
     )
 
-    global animated_robot
-    animated_robot = AnimatedRobot(ax_robot)
+    animated_robot = AnimatedRobot(ax_robot, icr_coordinates.shape[1])
 
-    global animated_plots
     animated_plots = AnimatedPlots(
-        ax_body_velocity,
-        ax_body_acceleration,
-        ax_body_jerk,
-        ax_body_angular_velocity,
-        ax_body_angular_acceleration,
-        ax_body_angular_jerk,
-        ax_module_orientation,
-        ax_module_angular_velocity,
-        ax_module_angular_acceleration,
-        ax_module_angular_jerk,
-        ax_module_velocity,
-        ax_module_acceleration,
-        ax_module_jerk,
+        graph_axes.get("body_velocity"),
+        graph_axes.get("body_acceleration"),
+        graph_axes.get("body_jerk"),
+        graph_axes.get("body_angular_velocity"),
+        graph_axes.get("body_angular_acceleration"),
+        graph_axes.get("body_angular_jerk"),
+        graph_axes.get("module_orientation"),
+        graph_axes.get("module_orientation_velocity"),
+        graph_axes.get("module_orientation_acceleration"),
+        graph_axes.get("module_orientation_jerk"),
+        graph_axes.get("module_velocity"),
+        graph_axes.get("module_acceleration"),
+        graph_axes.get("module_jerk"),
         drive_modules,
+        plots_enabled,
     )
 
+    # The labels of the lines never change, so the legends only have to be created once. They are
+    # drawn as part of the static background of the figure.
+    animated_plots.legend_refresh()
+
     # fig.tight_layout(pad=1.0)
     # main_grid.tight_layout(fig)
-    animation = FuncAnimation(
-        fig,
-        animate,
-        frames=range(len(points_in_time) // ANIMATION_FRAME_DIVIDER),
-        interval=100,
-        blit=True,
-        repeat=True,
-        repeat_delay=10,
-    )
 
-    # writer = FFMpegWriter()
-    # output_file_name = output_file_name_without_extension + ".mp4"
+    # The axis limits are all set before the animation starts, so the layout of the figure doesn't
+    # change between frames. Lay the figure out once and then stop the layout engine from running
+    # again for every frame that is drawn.
+    fig.canvas.draw()
+    fig.set_layout_engine("none")
 
     # writer = PillowWriter(fps=25)
 
-    writer = HTMLWriter(fps=10)
-    output_file_name = output_file_name_without_extension + ".html"
+    # Prefer piping the raw RGBA frames straight into ffmpeg so that long runs don't write a
+    # PNG file per frame to disk. Fall back to the HTML writer if ffmpeg isn't installed.
+    if FFMpegWriter.isAvailable():
+        writer = FFMpegWriter(
+            fps=10,
+            codec="libx264",
+            extra_args=[
+                "-preset",
+                "ultrafast",
+                "-tune",
+                "animation",
+                "-pix_fmt",
+                "yuv420p",
+            ],
+        )
+        output_file_name = output_file_name_without_extension + ".mp4"
+    else:
+        writer = HTMLWriter(fps=10)
+        output_file_name = output_file_name_without_extension + ".html"
+
+    # All the frame data is precomputed, so update the artists and hand each frame straight to the
+    # writer. Going through FuncAnimation.save draws every frame twice, once when the frame is
+    # updated and once more when the writer grabs it.
+    dpi = plt.rcParams["savefig.dpi"]
+    if dpi == "figure":
+        dpi = fig.dpi
+
+    with writer.saving(fig, output_file_name, dpi):
+        for frame_index in range(frame_count):
+            animate(frame_index, animation_data, animated_robot, animated_plots)
+            writer.grab_frame()
+
+
+def precompute_robot_frames(
+    body_outline_template: np.ndarray,
+    wheel_templates: np.ndarray,
+    icr_line_templates: np.ndarray,
+    steering_positions: np.ndarray,
+    body_positions: np.ndarray,
+    body_orientations: np.ndarray,
+    drive_module_orientations: np.ndarray,
+    icr_coordinates: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # Calculates the outlines of the robot body, the wheels, the ICR lines and the ICR points, in world
+    # coordinates, for all points in time so that the animation only has to look them up.
+    #
+    # Expects the body positions, (T, 2), the body orientations, (T,), the drive module
+    # orientations, (T, N), and the ICR coordinates in body coordinates, (T, K, 2).
+    #
+    # Returns the arrays (body outlines, wheels, ICR lines, ICR points) with the shapes
+    # (T, 2, 5), (T, N, 2, 5), (T, 2 * N, 2, 2) and (T, K, 2), where T is the number of points in
+    # time, N is the number of drive modules and K is the number of ICR points. The outlines are
+    # stored as rows of x- and y-coordinates, the ICR lines and points as (x, y) points.
+    # The body orientation and the drive module orientations for each point in time are stacked so
+    # that all rotation matrices, shape (T, 1 + N, 2, 2), are created with one cos and one sin call.
+    rotations = rotation_matrices(
+        np.concatenate(
+            [body_orientations[:, np.newaxis], drive_module_orientations], axis=1
+        )
+    )
+    body_rotations = rotations[:, 0]
+    drive_module_rotations = rotations[:, 1:]
+
+    # Rotate the body to the correct orientation and translate it to the position. All transforms
+    # are stacked matrix products, which np.matmul broadcasts over the leading time and drive
+    # module axes.
+    body_outlines = (
+        np.matmul(body_rotations, body_outline_template)
+        + body_positions[:, :, np.newaxis]
+    )
+
+    #
+    # DRIVE MODULES
+    #
+
+    # Rotating the wheel to the drive module orientation, translating it to the body, rotating it
+    # to match the body orientation and then translating it to the actual body coordinates is the
+    # same as applying a single rotation, R_body * R_module, and a single translation,
+    # R_body * steering_position + body_position.
+    world_rotations = np.matmul(body_rotations[:, np.newaxis], drive_module_rotations)
+    world_offsets = (
+        np.matmul(steering_positions, body_rotations.transpose(0, 2, 1))
+        + body_positions[:, np.newaxis, :]
+    )
+
+    wheels = (
+        np.matmul(world_rotations, wheel_templates) + world_offsets[:, :, :, np.newaxis]
+    )
+
+    # The ICR line templates are stored as two lines per drive module, so group them by drive module
+    # to apply the transform of the drive module they belong to. The lines are returned as the
+    # (x, y) points of their ends so that they can be handed to the line collection directly.
+    time_count, module_count = world_offsets.shape[0:2]
+    icr_lines = (
+        np.matmul(
+            world_rotations[:, :, np.newaxis],
+            icr_line_templates.reshape(module_count, 2, 2, 2),
+        ).swapaxes(-1, -2)
+        + world_offsets[:, :, np.newaxis, np.newaxis, :]
+    ).reshape(time_count, 2 * module_count, 2, 2)
+
+    #
+    # ICR
+    #
 
-    animation.save(output_file_name, writer=writer)
-    animation.save(output_file_name, writer=writer)
+    # Rotate the ICR to match the body orientation and translate it to the actual body coordinates.
+    # The ICR points are stored as rows, (K, 2), so they are multiplied by the transposed rotation.
+    icr_points = (
+        np.matmul(icr_coordinates, body_rotations.transpose(0, 2, 1))
+        + body_positions[:, np.newaxis, :]
+    )
+
+    return body_outlines, wheels, icr_lines, icr_points
+
+
+def rotation_matrices(angles: np.ndarray) -> np.ndarray:
+    # Returns the (T, 2, 2) stack of matrices that rotate a point counter-clockwise over the
+    # given angles
+    cos_angles = np.cos(angles)
+    sin_angles = np.sin(angles)
+    return np.stack(
+        [
+            np.stack([cos_angles, -sin_angles], axis=-1),
+            np.stack([sin_angles, cos_angles], axis=-1),
+        ],
+        axis=-2,
+    )
@@ -1,23 +1,24 @@
-from math import isclose, isinf
 from os import path
-from typing import List, Mapping, NamedTuple, Tuple
+from typing import AbstractSet, List, Mapping, NamedTuple, Tuple
 
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
-from sim_output.animate_robot import plot_movement_through_space
+from sim_output.animate_robot import ALL_PLOTS, plot_movement_through_space
 
 # local
-from swerve_controller.control_model import DriveModuleMeasuredValues, Point
+from swerve_controller.control_model import DriveModuleMeasuredValues
 from swerve_controller.drive_module import DriveModule
+from swerve_controller.geometry import Point
 from swerve_controller.states import BodyState
 
 
 class ProfilePlotValues(NamedTuple):
     name: str
     markers: Mapping[str, int]
-    x_values: List[float]
-    y_values: List[float]
+    x_values: np.ndarray
+    y_values: np.ndarray
     annotations: List[str] = []
 
 
@@ -51,14 +52,51 @@ def generate_plot_information(
         dict(color="darkkhaki", symbol="x-open", size=default_size),
     ]
 
+    # Copy the plotted body values out of the states in one pass. The columns are the x- and
+    # y-position, the orientation, the x- and y-velocity and the rotation velocity.
+    body_values = np.array(
+        [
+            [
+                b.position_in_world_coordinates.x,
+                b.position_in_world_coordinates.y,
+                b.orientation_in_world_coordinates.z,
+                b.motion_in_body_coordinates.linear_velocity.x,
+                b.motion_in_body_coordinates.linear_velocity.y,
+                b.motion_in_body_coordinates.angular_velocity.z,
+            ]
+            for b in body_states
+        ],
+        dtype=np.float64,
+    )
+    x_positions = body_values[:, 0]
+    y_positions = body_values[:, 1]
+
+    # Plotly serializes numpy arrays directly, so keep all the plotted values as arrays
+    times = np.asarray(points_in_time, dtype=np.float64)
+
+    # The plotted drive module values, (T, N, 2), stored as (drive velocity, orientation)
+    module_values = np.array(
+        [
+            [
+                [
+                    d.drive_velocity_in_module_coordinates.x,
+                    d.orientation_in_body_coordinates.z,
+                ]
+                for d in states_at_time
+            ]
+            for states_at_time in drive_states
+        ],
+        dtype=np.float64,
+    )
+
     # Body position
     plots.append(
         [
             ProfilePlotValues(
                 name="body position",
                 markers=markers[0],
-                x_values=[b.position_in_world_coordinates.x for b in body_states],
-                y_values=[b.position_in_world_coordinates.y for b in body_states],
+                x_values=x_positions,
+                y_values=y_positions,
                 annotations=points_in_time,
             )
         ]
@@ -69,20 +107,20 @@ def generate_plot_information(
             ProfilePlotValues(
                 name="body x-position",
                 markers=markers[0],
-                x_values=points_in_time,
-                y_values=[b.position_in_world_coordinates.x for b in body_states],
+                x_values=times,
+                y_values=x_positions,
             ),
             ProfilePlotValues(
                 name="body y-position",
                 markers=markers[1],
-                x_values=points_in_time,
-                y_values=[b.position_in_world_coordinates.y for b in body_states],
+                x_values=times,
+                y_values=y_positions,
             ),
             ProfilePlotValues(
                 name="body orientation",
                 markers=markers[2],
-                x_values=points_in_time,
-                y_values=[b.orientation_in_world_coordinates.z for b in body_states],
+                x_values=times,
+                y_values=body_values[:, 2],
             ),
         ]
     )
@@ -93,26 +131,20 @@ def generate_plot_information(
             ProfilePlotValues(
                 name="body x-velocity",
                 markers=markers[0],
-                x_values=points_in_time,
-                y_values=[
-                    b.motion_in_body_coordinates.linear_velocity.x for b in body_states
-                ],
+                x_values=times,
+                y_values=body_values[:, 3],
             ),
             ProfilePlotValues(
                 name="body y-velocity",
                 markers=markers[1],
-                x_values=points_in_time,
-                y_values=[
-                    b.motion_in_body_coordinates.linear_velocity.y for b in body_states
-                ],
+                x_values=times,
+                y_values=body_values[:, 4],
             ),
             ProfilePlotValues(
                 name="body rotation-velocity",
                 markers=markers[2],
-                x_values=points_in_time,
-                y_values=[
-                    b.motion_in_body_coordinates.angular_velocity.z for b in body_states
-                ],
+                x_values=times,
+                y_values=body_values[:, 5],
             ),
         ]
     )
@@ -129,11 +161,8 @@ def generate_plot_information(
             ProfilePlotValues(
                 name="{} drive velocity".format(drive_module.name),
                 markers=markers[module_index],
-                x_values=points_in_time,
-                y_values=[
-                    d[module_index].drive_velocity_in_module_coordinates.x
-                    for d in drive_states
-                ],
+                x_values=times,
+                y_values=module_values[:, module_index, 0],
             )
         )
 
@@ -159,11 +188,8 @@ def generate_plot_information(
             ProfilePlotValues(
                 name="{} drive orientation".format(drive_module.name),
                 markers=markers[module_index],
-                x_values=points_in_time,
-                y_values=[
-                    d[module_index].orientation_in_body_coordinates.z
-                    for d in drive_states
-                ],
+                x_values=times,
+                y_values=module_values[:, module_index, 1],
             )
         )
 
@@ -200,46 +226,41 @@ def generate_plot_information(
     icr_module_names: List[Tuple[str, str]] = [
         (i[0].name, i[1].name) for i in icr_coordinate_map[0][1]
     ]
-    x_values: List[List[float]] = [
-        [],
-        [],
-        [],
-        [],
-        [],
-        [],
+
+    # The ICR coordinates and the drive values that decide whether an ICR is plotted, (T, K, 4),
+    # stored as (x, y, drive velocity of the first module, drive acceleration of the second module)
+    icr_values = np.array(
+        [
+            [
+                [
+                    icr[2].x,
+                    icr[2].y,
+                    icr[0].drive_velocity_in_module_coordinates.x,
+                    icr[1].drive_acceleration_in_module_coordinates.x,
+                ]
+                for icr in icrs_at_time[1]
+            ]
+            for icrs_at_time in icr_coordinate_map
+        ],
+        dtype=np.float64,
+    )
+
+    # Only plot the ICRs that are close to the robot while the drive modules are moving. Infinite
+    # and NaN coordinates fail the distance check.
+    is_near = (np.abs(icr_values[:, :, 0]) < 25) & (np.abs(icr_values[:, :, 1]) < 25)
+    is_moving = ~(np.abs(icr_values[:, :, 2]) <= 1e-7) | ~(
+        np.abs(icr_values[:, :, 3]) <= 1e-7
+    )
+    is_plotted = is_near & is_moving
+
+    x_values: List[np.ndarray] = [
+        icr_values[is_plotted[:, index], index, 0]
+        for index in range(icr_values.shape[1])
     ]
-    y_values: List[List[float]] = [
-        [],
-        [],
-        [],
-        [],
-        [],
-        [],
+    y_values: List[np.ndarray] = [
+        icr_values[is_plotted[:, index], index, 1]
+        for index in range(icr_values.shape[1])
     ]
-    for icrs_at_time in icr_coordinate_map:
-        index = 0
-        for icr in icrs_at_time[1]:
-            if not isinf(icr[2].x) and not isinf(icr[2].y):
-                if abs(icr[2].x) < 25 and abs(icr[2].y) < 25:
-                    if (
-                        not isclose(
-                            icr[0].drive_velocity_in_module_coordinates.x,
-                            0.0,
-                            rel_tol=1e-7,
-                            abs_tol=1e-7,
-                        )
-                    ) or (
-                        not isclose(
-                            icr[1].drive_acceleration_in_module_coordinates.x,
-                            0.0,
-                            rel_tol=1e-7,
-                            abs_tol=1e-7,
-                        )
-                    ):
-                        x_values[index].append(icr[2].x)
-                        y_values[index].append(icr[2].y)
-
-            index += 1
 
     icr_plots: List[ProfilePlotValues] = []
     plots.append(icr_plots)
@@ -312,6 +333,7 @@ def plot_trajectories(
         ]
     ],
     color: str,
+    plots_enabled: AbstractSet[str] = ALL_PLOTS,
 ):
     # plots = generate_plot_information(points_in_time, body_states, drive_modules, drive_states, icr_coordinate_map, color)
     # figs = generate_plot_traces(plots)
@@ -324,6 +346,7 @@ def plot_trajectories(
         drive_states,
         icr_coordinate_map,
         plot_file_path,
+        plots_enabled=plots_enabled,
     )
 
     # index = 0
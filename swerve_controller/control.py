@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import List, Tuple
 
+import numpy as np
+
 # local
 from .control_model import ControlModelBase
 from .geometry import Vector3
@@ -63,18 +65,7 @@ class BodyMotionCommand(MotionCommand):
     # Determine what the state of the drive modules would be if the robot would execute
     # the current motion command.
     def to_drive_module_state(self, model: ControlModelBase) -> Tuple[List[DriveModuleDesiredValues]]:
-        drive_module_potential_states = model.state_of_wheel_modules_from_body_motion(
-            BodyMotion(
-                self.linear_velocity.x,
-                self.linear_velocity.y,
-                self.angular_velocity.z,
-                0.0,
-                0.0,
-                0.0,
-                0.0,
-                0.0,
-                0.0,
-            ))
+        drive_module_potential_states = model.state_of_wheel_modules_from_body_motion(self.to_body_state(model))
         return (
             [x[0] for x in drive_module_potential_states],
             [x[1] for x in drive_module_potential_states],
@@ -90,6 +81,11 @@ class DriveModuleMotionCommand(MotionCommand):
         self.time_span = time_span
         self.desired_states = desired_states
 
+        # The desired steering angles and drive velocities, in the order of the drive modules, so that the
+        # body motion can be calculated without going back to the individual states
+        self.steering_angles = np.array([x.steering_angle_in_radians for x in desired_states], dtype=np.float64)
+        self.drive_velocities = np.array([x.drive_velocity_in_meters_per_second for x in desired_states], dtype=np.float64)
+
     # The timespan over which the command should be executed
     def time_for_motion(self) -> float:
         return self.time_span
@@ -97,7 +93,7 @@ class DriveModuleMotionCommand(MotionCommand):
     # Determine what the body state would be if the robot would execute the current
     # motion command.
     def to_body_state(self, model: ControlModelBase) -> BodyMotion:
-        return model.body_motion_from_wheel_module_states(self.desired_states)
+        return model.body_motion_from_wheel_module_values(self.steering_angles, self.drive_velocities)
 
     # Determine what the state of the drive modules would be if the robot would execute
     # the current motion command.
@@ -26,6 +26,18 @@ def normalize_angle(angle_in_radians: float) -> float:
 
     return angle
 
+# Normalizes all the angles in the array to [-pi, pi]
+def normalize_angles(angles_in_radians: np.ndarray) -> np.ndarray:
+    # reduce the angles to [-2pi, 2pi]
+    angles = np.mod(angles_in_radians, 2 * math.pi)
+
+    # Force the angles to the between 0 and 2pi
+    angles = np.mod(angles + 2 * math.pi, 2 * math.pi)
+
+    angles[angles > math.pi] -= 2 * math.pi
+
+    return angles
+
 def difference_between_angles(starting_angle_in_radians: float, ending_angle_in_radians: float) -> float:
     normalized_start = normalize_angle(starting_angle_in_radians)
     normalized_end = normalize_angle(ending_angle_in_radians)
@@ -51,12 +63,22 @@ class ControlModelBase(object):
     def body_motion_from_wheel_module_states(self, states: List[DriveModuleMeasuredValues]) -> BodyMotion:
         return BodyMotion(0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
 
+    # Forward kinematics from the steering angles and the drive velocities of the drive modules. Both arrays
+    # are ordered in the same way as the drive modules of the model.
+    def body_motion_from_wheel_module_values(self, steering_angles: np.ndarray, drive_velocities: np.ndarray) -> BodyMotion:
+        return BodyMotion(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
     # Returns the proposed wheel states which will achieve the given body motion. The list will contain
     # both a forward, i.e. with the steering angle such that the drive motor turns 'forwards', and a
     # reverse state, i.e. with the steering angle such that the drive motor turns 'backwards'.
     def state_of_wheel_modules_from_body_motion(self, state: BodyMotion) -> List[Tuple[DriveModuleDesiredValues, DriveModuleDesiredValues]]:
         return []
 
+    # Returns the proposed wheel states, as given by state_of_wheel_modules_from_body_motion, for each of the
+    # body motions in the sequence.
+    def state_of_wheel_modules_from_body_motions(self, states: List[BodyMotion]) -> List[List[Tuple[DriveModuleDesiredValues, DriveModuleDesiredValues]]]:
+        return [self.state_of_wheel_modules_from_body_motion(state) for state in states]
+
 class SimpleFourWheelSteeringControlModel(ControlModelBase):
 
     def __init__(self, drive_modules: List[DriveModule]):
@@ -94,6 +116,12 @@ class SimpleFourWheelSteeringControlModel(ControlModelBase):
             arr.append(y_vel)
 
         self.inverse_kinematics_matrix = np.array(arr)
+
+        # The [n ; 2] array of the steering axis positions, used to compute the drive module states for multiple
+        # body motions at once
+        self.steering_axis_positions = np.array(
+            [[x.steering_axis_xy_position.x, x.steering_axis_xy_position.y] for x in drive_modules],
+            dtype=np.float64).reshape(-1, 2)
         self.forward_kinematics_matrix = pinv(self.inverse_kinematics_matrix)
 
     # Forward kinematics
@@ -128,6 +156,27 @@ class SimpleFourWheelSteeringControlModel(ControlModelBase):
             0.0,
             0.0,)
 
+    # Forward kinematics from the steering angles and the drive velocities of the drive modules. Both arrays
+    # are ordered in the same way as the drive modules of the model.
+    def body_motion_from_wheel_module_values(self, steering_angles: np.ndarray, drive_velocities: np.ndarray) -> BodyMotion:
+        # Calculate the v_x and v_y for all modules at once, stored as [v_1_x, v_1_y, v_2_x, v_2_y, ... , v_n_x, v_n_y]
+        drive_state_vector = np.empty(2 * len(drive_velocities), dtype=np.float64)
+        drive_state_vector[0::2] = drive_velocities * np.cos(steering_angles)
+        drive_state_vector[1::2] = drive_velocities * np.sin(steering_angles)
+
+        body_state_vector = np.matmul(self.forward_kinematics_matrix, drive_state_vector)
+
+        return BodyMotion(
+            body_state_vector[0],
+            body_state_vector[1],
+            body_state_vector[2],
+            0.0,
+            0.0,
+            0.0,
+            0.0,
+            0.0,
+            0.0,)
+
     # Inverse kinematics
     def state_of_wheel_modules_from_body_motion(self, state: BodyMotion) -> List[Tuple[DriveModuleDesiredValues, DriveModuleDesiredValues]]:
         # Kinematics
@@ -136,39 +185,21 @@ class SimpleFourWheelSteeringControlModel(ControlModelBase):
         # -
         # For wheel i
         #  - velocity = sqrt( (v_x - omega * y_i)^2 + (v_y + omega * x_i)^2 )
-        #  - angle = acos( (v_x - omega * y_i) / (velocity) ) = asin( (v_y + omega * x_i) / (velocity) )
-        #
-        # Angle: 0 < alpha < Pi
-        #  The angle also needs a differentiation if it should go between Pi and 2Pi
+        #  - angle = atan2( (v_y + omega * x_i), (v_x - omega * y_i) )
         #
         # This assumes that (x_i, y_i) is the coordinate for the steering axis. And that the steering axis is in z-direction.
         # And that the wheel contact point is on that steering axis
+        body_x_velocity = state.linear_velocity.x
+        body_y_velocity = state.linear_velocity.y
+        body_rotation_velocity = state.angular_velocity.z
+
+        result: List[Tuple[DriveModuleDesiredValues, DriveModuleDesiredValues]] = []
+        for drive_module in self.modules:
+            v_x = body_x_velocity - body_rotation_velocity * drive_module.steering_axis_xy_position.y
+            v_y = body_y_velocity + body_rotation_velocity * drive_module.steering_axis_xy_position.x
+            drive_velocity = math.sqrt(v_x * v_x + v_y * v_y)
 
-        body_state_array: List[float] = [
-            state.linear_velocity.x,
-            state.linear_velocity.y,
-            state.angular_velocity.z
-        ]
-        body_state_vector = np.array(body_state_array)
-        drive_state_vector = np.matmul(self.inverse_kinematics_matrix, body_state_vector)
-
-        # Calculate the drive speeds
-        drive_velocities: List[float] = []
-        for i in range(len(self.modules)):
-
-            v_x = drive_state_vector[2 * i + 0]
-            v_y = drive_state_vector[2 * i + 1]
-            drive_velocity = math.sqrt(pow(v_x, 2.0) + pow(v_y, 2.0))
-            drive_velocities.append(drive_velocity)
-
-        # Assume that the steering angle is between 0 and 2 * pi
-        result: List[Tuple[DriveModuleDesiredValues]] = []
-        for i in range(len(self.modules)):
-            v_x = drive_state_vector[2 * i + 0]
-            v_y = drive_state_vector[2 * i + 1]
-            drive_velocity = drive_velocities[i]
-
-            if math.isclose(drive_velocity, 0.0, rel_tol=1e-9, abs_tol=1e-9):
+            if drive_velocity <= 1e-9:
                 # If the other wheels are moving then we might be rotating around the current wheel, so then rotate with the
                 # same rotational velocity as the body, but negative
                 #
@@ -176,47 +207,20 @@ class SimpleFourWheelSteeringControlModel(ControlModelBase):
                 #
                 # In either case we just keep the position of the wheel where it was
                 forward_steering_angle = float('infinity')
+                reverse_steering_angle = float('-infinity')
             else:
-                # Calculate the position of the drive wheel.
-                #
-                # math.acos returns values between 0 and pi
-                cos_angle = math.acos(v_x / drive_velocity)
-
-                # math.asin returns values between -1/2 pi and 1/2 pi
-                sin_angle = math.asin(v_y / drive_velocity)
-
-                # The acos value decides if the wheel orientation is between 0 - 90 degrees or 90 - 180 degrees, i.e. top and bottom, but
-                # doesn't distinguish between left and right
-                # the asin value decides if the wheel orientation is between 90 - 0 degrees or 360 - 270 degrees, i.e. left and right
-                if cos_angle <= 0.5 * math.pi:
-                    if sin_angle < 0:
-                        forward_steering_angle = sin_angle #+ 2 * math.pi
-                    else:
-                        forward_steering_angle = sin_angle
-                else:
-                    # cos_angle is larger than 1/2 * pi. In that case if the
-                    if sin_angle < 0:
-                        # In this case we want to mirror the current angle relative to Pi (or 180 degrees)
-                        forward_steering_angle = self.steering_value_space.smallest_distance_between_values(cos_angle, math.pi) + math.pi
-                    else:
-                        forward_steering_angle = cos_angle
-
-                forward_steering_angle = self.steering_value_space.normalize_value(forward_steering_angle)
-
-            if not math.isinf(forward_steering_angle):
-                reverse_steering_angle = self.steering_value_space.normalize_value(forward_steering_angle + math.pi)
-            else:
-                reverse_steering_angle = float("-infinity")
+                # Calculate the position of the drive wheel. math.atan2 returns values between -pi and pi
+                forward_steering_angle = normalize_angle(math.atan2(v_y, v_x))
+                reverse_steering_angle = normalize_angle(forward_steering_angle + math.pi)
 
-            name = self.modules[i].name
             forward_state = DriveModuleDesiredValues(
-                name,
+                drive_module.name,
                 forward_steering_angle,
                 drive_velocity,
             )
 
             reverse_state = DriveModuleDesiredValues(
-                name,
+                drive_module.name,
                 reverse_steering_angle,
                 -1.0 * drive_velocity,
             )
@@ -224,5 +228,43 @@ class SimpleFourWheelSteeringControlModel(ControlModelBase):
 
         return result
 
+    # Inverse kinematics for a sequence of body motions, e.g. the body motions along a trajectory. Uses the
+    # same equations as state_of_wheel_modules_from_body_motion, but computes the values for all the body
+    # motions and drive modules at once.
+    def state_of_wheel_modules_from_body_motions(self, states: List[BodyMotion]) -> List[List[Tuple[DriveModuleDesiredValues, DriveModuleDesiredValues]]]:
+        # [N ; 1] arrays of the body velocities
+        body_x_velocities = np.array([[state.linear_velocity.x] for state in states], dtype=np.float64).reshape(-1, 1)
+        body_y_velocities = np.array([[state.linear_velocity.y] for state in states], dtype=np.float64).reshape(-1, 1)
+        body_rotation_velocities = np.array([[state.angular_velocity.z] for state in states], dtype=np.float64).reshape(-1, 1)
+
+        # [N ; n] arrays of the drive module velocities
+        v_x = body_x_velocities - body_rotation_velocities * self.steering_axis_positions[:, 1]
+        v_y = body_y_velocities + body_rotation_velocities * self.steering_axis_positions[:, 0]
+        drive_velocities = np.sqrt(v_x * v_x + v_y * v_y)
+
+        forward_steering_angles = normalize_angles(np.arctan2(v_y, v_x))
+        reverse_steering_angles = normalize_angles(forward_steering_angles + math.pi)
+
+        is_stopped = drive_velocities <= 1e-9
+        forward_steering_angles[is_stopped] = float('infinity')
+        reverse_steering_angles[is_stopped] = float('-infinity')
+
+        names = [drive_module.name for drive_module in self.modules]
+
+        result: List[List[Tuple[DriveModuleDesiredValues, DriveModuleDesiredValues]]] = []
+        for forward_angles, reverse_angles, velocities in zip(
+                forward_steering_angles.tolist(),
+                reverse_steering_angles.tolist(),
+                drive_velocities.tolist()):
+            result.append(
+                [
+                    (
+                        DriveModuleDesiredValues(name, forward_angle, velocity),
+                        DriveModuleDesiredValues(name, reverse_angle, -1.0 * velocity),
+                    )
+                    for name, forward_angle, reverse_angle, velocity in zip(names, forward_angles, reverse_angles, velocities)
+                ])
+
+        return result
 
 # Implement the Seegmiller algorithms in a different controller
@@ -2,6 +2,8 @@ import math
 from abc import ABC, abstractmethod
 from typing import Callable, List, Mapping, Tuple
 
+import numpy as np
+
 from swerve_controller.control_model import ControlModelBase
 from swerve_controller.geometry import (
     LinearUnboundedSpace,
@@ -350,23 +352,32 @@ class ValueDerrivativeSet(object):
         self.third_derivative = third_derivative
 
 
-class TimeStatePair(object):
-    def __init__(self, time_fraction: float, state: List[ValueDerrivativeSet]):
-        self.time_fraction = time_fraction
-        self.state = state
-
-
 class LimitedDriveModuleProfile(object):
     def __init__(self, drive_modules: List[DriveModule]):
         self.drive_modules = drive_modules
 
-        # Store the steering angles for each point in time for each module
-        # The first value is the time fraction, the second value is a list of steering angles for each module
-        self.steering_profiles: List[TimeStatePair] = []
-
-        # Store the drive velocities for each point in time for each module
-        # The first value is the time fraction, the second value is a list of drive velocities for each module
-        self.velocity_profiles: List[TimeStatePair] = []
+        # The points that are added to the profile. For each point we store the time step leading up to
+        # the point, the steering angle for each module and the drive velocity for each module. The points
+        # are copied to the arrays below when the profiles are limited.
+        self._added_time_steps: List[float] = []
+        self._added_steering_angles: List[List[float]] = []
+        self._added_drive_velocities: List[List[float]] = []
+
+        # The time step leading up to each point in time
+        self.time_fractions: np.ndarray = np.zeros(0)
+
+        # Store the steering angles, and their derivatives, for each point in time for each module. There
+        # is one row for each point in time and one column for each module
+        self.steering_angles: np.ndarray = np.zeros((0, len(drive_modules)))
+        self.steering_velocities: np.ndarray = np.zeros((0, len(drive_modules)))
+        self.steering_accelerations: np.ndarray = np.zeros((0, len(drive_modules)))
+        self.steering_jerks: np.ndarray = np.zeros((0, len(drive_modules)))
+
+        # Store the drive velocities, and their derivatives, for each point in time for each module. There
+        # is one row for each point in time and one column for each module
+        self.drive_velocities: np.ndarray = np.zeros((0, len(drive_modules)))
+        self.drive_accelerations: np.ndarray = np.zeros((0, len(drive_modules)))
+        self.drive_jerks: np.ndarray = np.zeros((0, len(drive_modules)))
 
     def add_profile_point(
         self,
@@ -374,22 +385,10 @@ class LimitedDriveModuleProfile(object):
         steering_angle: List[float],
         drive_velocity: List[float],
     ):
-        steering_mapping: List[ValueDerrivativeSet] = []
-        drive_mapping: List[ValueDerrivativeSet] = []
-        for index in range(len(self.drive_modules)):
-            steering_mapping.append(
-                ValueDerrivativeSet(steering_angle[index], 0.0, 0.0, 0.0)
-            )
-            drive_mapping.append(
-                ValueDerrivativeSet(drive_velocity[index], 0.0, 0.0, 0.0)
-            )
-
-        self.steering_profiles.append(
-            TimeStatePair(time_step_leading_up_to_value, steering_mapping)
-        )
-        self.velocity_profiles.append(
-            TimeStatePair(time_step_leading_up_to_value, drive_mapping)
-        )
+        module_count = len(self.drive_modules)
+        self._added_time_steps.append(time_step_leading_up_to_value)
+        self._added_steering_angles.append(steering_angle[:module_count])
+        self._added_drive_velocities.append(drive_velocity[:module_count])
 
     def add_start_point(
         self,
@@ -397,172 +396,70 @@ class LimitedDriveModuleProfile(object):
         steering_angle: List[ValueDerrivativeSet],
         drive_velocity: List[ValueDerrivativeSet],
     ):
-        steering_mapping: List[ValueDerrivativeSet] = []
-        drive_mapping: List[ValueDerrivativeSet] = []
-        for index in range(len(self.drive_modules)):
-            steering_mapping.append(steering_angle[index])
-            drive_mapping.append(drive_velocity[index])
-
-        self.steering_profiles.append(
-            TimeStatePair(time_step_leading_up_to_value, steering_mapping)
+        module_count = len(self.drive_modules)
+        self._added_time_steps.append(time_step_leading_up_to_value)
+        self._added_steering_angles.append(
+            [x.value for x in steering_angle[:module_count]]
         )
-        self.velocity_profiles.append(
-            TimeStatePair(time_step_leading_up_to_value, drive_mapping)
+        self._added_drive_velocities.append(
+            [x.value for x in drive_velocity[:module_count]]
         )
 
-    def calculate_accelerations(self):
-        # Steering angle
-        for index in range(len(self.steering_profiles)):
-            current_points = self.steering_profiles[index]
-
-            if index == 0:
-                # First point
-                # TODO: If we ever get non-zero velocities / accelerations then we need to plug those in here
-                for module_index in range(len(self.drive_modules)):
-                    current_points.state[module_index].second_derivative = 0.0
-            else:
-                # Not the first point or the last point
-                previous_points = self.steering_profiles[index - 1]
-
-                time_difference_in_the_past = current_points.time_fraction
-
-                for module_index in range(len(self.drive_modules)):
-                    previous_value = previous_points.state[
-                        module_index
-                    ].first_derivative
-                    current_value = current_points.state[module_index].first_derivative
-
-                    acceleration_from_past = (
-                        current_value - previous_value
-                    ) / time_difference_in_the_past
-                    self.steering_profiles[index].state[
-                        module_index
-                    ].second_derivative = acceleration_from_past
-
-        # Drive velocity
-        for index in range(len(self.velocity_profiles)):
-            current_points = self.velocity_profiles[index]
-
-            if index == 0:
-                # First point
-                # TODO: If we ever get non-zero velocities / accelerations then we need to plug those in here
-                for module_index in range(len(self.drive_modules)):
-                    current_points.state[module_index].first_derivative = 0.0
-            elif index == len(self.velocity_profiles) - 1:
-                # Last point
-                for module_index in range(len(self.drive_modules)):
-                    current_points.state[module_index].first_derivative = 0.0
-            else:
-                # Not the first point or the last point
-                previous_points = self.velocity_profiles[index - 1]
-
-                time_difference_in_the_past = current_points.time_fraction
-
-                for module_index in range(len(self.drive_modules)):
-                    previous_value = previous_points.state[module_index].value
-                    current_value = current_points.state[module_index].value
-
-                    acceleration_from_past = (
-                        current_value - previous_value
-                    ) / time_difference_in_the_past
-                    self.velocity_profiles[index].state[
-                        module_index
-                    ].first_derivative = acceleration_from_past
-
     def calculate_derrivatives(self):
-        self.calculate_velocities()
-        self.calculate_accelerations()
-        self.calculate_jerks()
+        # Calculate all the derivatives from the current values and time steps in one pass. Each
+        # derivative at a point is the difference with the previous point divided by the time step
+        # leading up to the point.
+        time_steps = self.time_fractions[1:, np.newaxis]
+        inner_time_steps = self.time_fractions[1:-1, np.newaxis]
 
-    def calculate_jerks(self):
         # Steering angle
-        for index in range(len(self.steering_profiles)):
-            current_points = self.steering_profiles[index]
-
-            if index == 0:
-                # First point
-                # TODO: If we ever get non-zero velocities / accelerations then we need to plug those in here
-                for module_index in range(len(self.drive_modules)):
-                    current_points.state[module_index].third_derivative = 0.0
-            else:
-                # Not the first point or the last point
-                previous_points = self.steering_profiles[index - 1]
-
-                time_difference_in_the_past = current_points.time_fraction
-
-                for module_index in range(len(self.drive_modules)):
-                    previous_value = previous_points.state[
-                        module_index
-                    ].second_derivative
-                    current_value = current_points.state[module_index].second_derivative
-
-                    jerk_from_past = (
-                        current_value - previous_value
-                    ) / time_difference_in_the_past
-                    self.steering_profiles[index].state[
-                        module_index
-                    ].third_derivative = jerk_from_past
-
-        # Drive velocity
-        for index in range(len(self.velocity_profiles)):
-            current_points = self.velocity_profiles[index]
-
-            if index == 0:
-                # First point
-                # TODO: If we ever get non-zero velocities / accelerations then we need to plug those in here
-                for module_index in range(len(self.drive_modules)):
-                    current_points.state[module_index].second_derivative = 0.0
-            elif index == len(self.velocity_profiles) - 1:
-                # Last point
-                for module_index in range(len(self.drive_modules)):
-                    current_points.state[module_index].second_derivative = 0.0
-            else:
-                # Not the first point or the last point
-                previous_points = self.velocity_profiles[index - 1]
-
-                time_difference_in_the_past = current_points.time_fraction
-
-                for module_index in range(len(self.drive_modules)):
-                    previous_value = previous_points.state[
-                        module_index
-                    ].first_derivative
-                    current_value = current_points.state[module_index].first_derivative
-
-                    jerk_from_past = (
-                        current_value - previous_value
-                    ) / time_difference_in_the_past
-                    self.velocity_profiles[index].state[
-                        module_index
-                    ].second_derivative = jerk_from_past
-
-    def calculate_velocities(self):
-        # Only do the steering velocity because there is no need to calculate the drive velocity as it is already calculated
-        for index in range(len(self.steering_profiles)):
-            current_points = self.steering_profiles[index]
-
-            if index == 0:
-                # First point
-                # TODO: If we ever get non-zero velocities / accelerations then we need to plug those in here
-                for module_index in range(len(self.drive_modules)):
-                    current_points.state[module_index].first_derivative = 0.0
-            else:
-                # Not the first point or the last point
-                previous_points = self.steering_profiles[index - 1]
+        # TODO: If we ever get non-zero velocities / accelerations then we need to plug those in here
+        self.steering_velocities[:1] = 0.0
+        self.steering_velocities[1:] = (
+            np.diff(self.steering_angles, axis=0) / time_steps
+        )
 
-                time_difference_in_the_past = current_points.time_fraction
+        self.steering_accelerations[:1] = 0.0
+        self.steering_accelerations[1:] = (
+            np.diff(self.steering_velocities, axis=0) / time_steps
+        )
 
-                for module_index in range(len(self.drive_modules)):
-                    previous_value = previous_points.state[module_index].value
-                    current_value = current_points.state[module_index].value
+        self.steering_jerks[:1] = 0.0
+        self.steering_jerks[1:] = (
+            np.diff(self.steering_accelerations, axis=0) / time_steps
+        )
+
+        # Drive velocity. There is no need to calculate the drive velocity as it is already calculated.
+        # The first and last point have no acceleration and no jerk
+        self.drive_accelerations[1:-1] = (
+            self.drive_velocities[1:-1] - self.drive_velocities[:-2]
+        ) / inner_time_steps
+        self.drive_accelerations[:1] = 0.0
+        self.drive_accelerations[-1:] = 0.0
 
-                    velocity_from_past = (
-                        current_value - previous_value
-                    ) / time_difference_in_the_past
-                    self.steering_profiles[index].state[
-                        module_index
-                    ].first_derivative = velocity_from_past
+        self.drive_jerks[1:-1] = (
+            self.drive_accelerations[1:-1] - self.drive_accelerations[:-2]
+        ) / inner_time_steps
+        self.drive_jerks[:1] = 0.0
+        self.drive_jerks[-1:] = 0.0
 
     def limit_profiles(self):
+        # Copy the points that were added into the arrays, with one row per point in time
+        module_count = len(self.drive_modules)
+        self.time_fractions = np.array(self._added_time_steps, dtype=np.float64)
+        self.steering_angles = np.array(
+            self._added_steering_angles, dtype=np.float64
+        ).reshape(-1, module_count)
+        self.drive_velocities = np.array(
+            self._added_drive_velocities, dtype=np.float64
+        ).reshape(-1, module_count)
+
+        self.steering_velocities = np.zeros_like(self.steering_angles)
+        self.steering_accelerations = np.zeros_like(self.steering_angles)
+        self.steering_jerks = np.zeros_like(self.steering_angles)
+        self.drive_accelerations = np.zeros_like(self.drive_velocities)
+        self.drive_jerks = np.zeros_like(self.drive_velocities)
+
         self.calculate_derrivatives()
 
         # When aligning profiles we want to align the steering angle/velocity/acceleration/jerk, and then the drive
@@ -580,37 +477,40 @@ class LimitedDriveModuleProfile(object):
         # - Limit the acceleration:
         #       Calculate the ratio between the desired and actual acceleration and scale the timestep by that ratio squared
 
+        # The limiting below walks through the points one at a time, with each step depending on the
+        # previous ones. Do that on plain floats and store the results back in the arrays when done.
+        module_count = len(self.drive_modules)
+        point_count = len(self.time_fractions)
+        time_fractions: List[float] = self.time_fractions.tolist()
+        steering_angles: List[List[float]] = self.steering_angles.tolist()
+
         # For each timestep find the biggest values in the steering angle/velocity/acceleration/jerk
-        for time_index, time_pair in enumerate(self.steering_profiles):
+        steering_velocities: List[List[float]] = self.steering_velocities.tolist()
+        for time_index in range(point_count):
+            velocities = steering_velocities[time_index]
             max_steering_velocity = 0.0
             max_steering_velocity_index = -1
 
-            for module_index in range(len(self.drive_modules)):
-                steering_velocity = abs(time_pair.state[module_index].first_derivative)
+            for module_index in range(module_count):
+                steering_velocity = abs(velocities[module_index])
 
                 if steering_velocity > max_steering_velocity:
                     max_steering_velocity = steering_velocity
                     max_steering_velocity_index = module_index
 
             # Limit the steering velocity. Assume a linear change between the previous point and the current one.
-            if (
-                max_steering_velocity
-                > self.drive_modules[
-                    max_steering_velocity_index
-                ].steering_motor_maximum_velocity
-            ):
+            maximum_velocity = self.drive_modules[
+                max_steering_velocity_index
+            ].steering_motor_maximum_velocity
+            if max_steering_velocity > maximum_velocity:
                 # Calculate the time step needed to reduce the velocity to the maximum velocity
                 #   v_max = (s_curr - s_prev) / time_step -> time_step = (s_curr - s_prev) / v_max
                 new_time_step = (
                     abs(
-                        time_pair.state[max_steering_velocity_index].value
-                        - self.steering_profiles[time_index - 1]
-                        .state[max_steering_velocity_index]
-                        .value
+                        steering_angles[time_index][max_steering_velocity_index]
+                        - steering_angles[time_index - 1][max_steering_velocity_index]
                     )
-                    / self.drive_modules[
-                        max_steering_velocity_index
-                    ].steering_motor_maximum_velocity
+                    / maximum_velocity
                 )
 
                 # If the timestep is larger than th original one then we can potentially insert
@@ -626,33 +526,36 @@ class LimitedDriveModuleProfile(object):
                 # and next point to ensure that we achieve the minimum velocity / acceleration
 
                 # Increase the timestep so that we end up in the same location
-                time_pair.time_fraction = new_time_step
-                self.velocity_profiles[time_index].time_fraction = new_time_step
+                time_fractions[time_index] = new_time_step
+
+        self.time_fractions[:] = time_fractions
 
         # limit the steering acceleration
         # For each timestep find the biggest values in the acceleration
-        self.calculate_velocities()
-        self.calculate_accelerations()
-        for time_index, time_pair in enumerate(self.steering_profiles):
+        self.calculate_derrivatives()
+        steering_velocities = self.steering_velocities.tolist()
+        steering_accelerations: List[List[float]] = self.steering_accelerations.tolist()
+        for time_index in range(point_count):
+            current_angles = steering_angles[time_index]
+            previous_angles = steering_angles[time_index - 1]
+            current_velocities = steering_velocities[time_index]
+            previous_velocities = steering_velocities[time_index - 1]
+            current_accelerations = steering_accelerations[time_index]
             max_steering_acceleration = 0.0
             max_steering_acceleration_index = -1
 
-            for module_index in range(len(self.drive_modules)):
-                steering_acceleration = abs(
-                    time_pair.state[module_index].second_derivative
-                )
+            for module_index in range(module_count):
+                steering_acceleration = abs(current_accelerations[module_index])
 
                 if steering_acceleration > max_steering_acceleration:
                     max_steering_acceleration = steering_acceleration
                     max_steering_acceleration_index = module_index
 
             # Limit the steering acceleration. Assume a linear change between the previous point and the current one.
-            if (
-                max_steering_acceleration
-                > self.drive_modules[
-                    max_steering_acceleration_index
-                ].steering_motor_maximum_acceleration
-            ):
+            maximum_acceleration = self.drive_modules[
+                max_steering_acceleration_index
+            ].steering_motor_maximum_acceleration
+            if max_steering_acceleration > maximum_acceleration:
                 # Calculate the time step needed to reduce the acceleration to the maximum acceleration
                 #
                 #  a_max = (v_curr - v_prev) / time_step
@@ -668,37 +571,32 @@ class LimitedDriveModuleProfile(object):
                 #  a_max * time_step^2 = (s_curr - s_prev) - v_prev * time_step -> time_step^2 * a_max + v_prev * time_step - (s_curr - s_prev) = 0
                 #
                 # Make sure that we use the correct maximum acceleration
+                steering_acceleration = current_accelerations[
+                    max_steering_acceleration_index
+                ]
                 max_accel = (
-                    self.drive_modules[
-                        max_steering_acceleration_index
-                    ].steering_motor_maximum_acceleration
-                    * abs(
-                        time_pair.state[
-                            max_steering_acceleration_index
-                        ].second_derivative
-                    )
-                    / time_pair.state[max_steering_acceleration_index].second_derivative
+                    maximum_acceleration
+                    * abs(steering_acceleration)
+                    / steering_acceleration
                 )
 
                 # work out the solution to the quadratic equation
                 #   -b +- sqrt(b^2 - 4ac) / 2a
                 a = max_accel
-                b = (
-                    self.steering_profiles[time_index - 1]
-                    .state[max_steering_acceleration_index]
-                    .first_derivative
-                )
+                b = previous_velocities[max_steering_acceleration_index]
                 c = (
-                    self.steering_profiles[time_index - 1]
-                    .state[max_steering_acceleration_index]
-                    .value
-                    - time_pair.state[max_steering_acceleration_index].value
+                    previous_angles[max_steering_acceleration_index]
+                    - current_angles[max_steering_acceleration_index]
                 )
                 discriminant = b * b - 4.0 * a * c
+                sqrt_discriminant = math.sqrt(discriminant)
+                two_a = 2.0 * a
 
-                solution_1 = (-b + math.sqrt(discriminant)) / (2.0 * a)
-                solution_2 = (-b - math.sqrt(discriminant)) / (2.0 * a)
+                solution_1 = (-b + sqrt_discriminant) / two_a
+                solution_2 = (-b - sqrt_discriminant) / two_a
 
+                time_fraction = time_fractions[time_index]
+                previous_time_fraction = time_fractions[time_index - 1]
                 if solution_1 <= 0.0:
                     new_time_step = solution_2
                 elif solution_2 <= 0.0:
@@ -707,31 +605,25 @@ class LimitedDriveModuleProfile(object):
                     # if one of the time steps is very different from the existing timestep (i.e. very large or very small)
                     # then we use the other one
                     solution_1_ratio = (
-                        solution_1 / time_pair.time_fraction
-                        if solution_1 > time_pair.time_fraction
-                        else time_pair.time_fraction / solution_1
+                        solution_1 / time_fraction
+                        if solution_1 > time_fraction
+                        else time_fraction / solution_1
                     )
                     solution_2_ratio = (
-                        solution_2 / time_pair.time_fraction
-                        if solution_2 > time_pair.time_fraction
-                        else time_pair.time_fraction / solution_2
+                        solution_2 / time_fraction
+                        if solution_2 > time_fraction
+                        else time_fraction / solution_2
                     )
 
                     solution_1_to_previous_ratio = (
-                        solution_1
-                        / self.steering_profiles[time_index - 1].time_fraction
-                        if solution_1
-                        > self.steering_profiles[time_index - 1].time_fraction
-                        else self.steering_profiles[time_index - 1].time_fraction
-                        / solution_1
+                        solution_1 / previous_time_fraction
+                        if solution_1 > previous_time_fraction
+                        else previous_time_fraction / solution_1
                     )
                     solution_2_to_previous_ratio = (
-                        solution_2
-                        / self.steering_profiles[time_index - 1].time_fraction
-                        if solution_2
-                        > self.steering_profiles[time_index - 1].time_fraction
-                        else self.steering_profiles[time_index - 1].time_fraction
-                        / solution_2
+                        solution_2 / previous_time_fraction
+                        if solution_2 > previous_time_fraction
+                        else previous_time_fraction / solution_2
                     )
 
                     if solution_1_ratio > solution_2_ratio:
@@ -763,92 +655,79 @@ class LimitedDriveModuleProfile(object):
                 #
                 # So maybe this is physics telling us that we need a better general approach
 
-                if new_time_step < time_pair.time_fraction:
+                if new_time_step < time_fraction:
                     pass
 
                 # Increase the timestep so that we end up in the same location
-                reduction_ratio = time_pair.time_fraction / new_time_step
-                time_pair.time_fraction = new_time_step
-                self.velocity_profiles[time_index].time_fraction = new_time_step
+                reduction_ratio = time_fraction / new_time_step
+                time_fractions[time_index] = new_time_step
 
                 # Reduce all the velocities, accelerations and jerks
-                for module_index in range(len(self.drive_modules)):
+                has_next_point = time_index < point_count - 1
+                if has_next_point:
+                    next_velocities = steering_velocities[time_index + 1]
+                    next_accelerations = steering_accelerations[time_index + 1]
+                    next_time_fraction = time_fractions[time_index + 1]
+
+                for module_index in range(module_count):
                     # recalculate the velocity
-                    time_pair.state[module_index].first_derivative = (
-                        time_pair.state[module_index].first_derivative * reduction_ratio
-                    )
+                    velocity = current_velocities[module_index] * reduction_ratio
+                    current_velocities[module_index] = velocity
 
                     # Recalculate the acceleration
-                    previous_velocity = (
-                        self.steering_profiles[time_index - 1]
-                        .state[module_index]
-                        .first_derivative
-                    )
-                    time_pair.state[module_index].second_derivative = (
-                        time_pair.state[module_index].first_derivative
-                        - previous_velocity
-                    ) / time_pair.time_fraction
+                    current_accelerations[module_index] = (
+                        velocity - previous_velocities[module_index]
+                    ) / new_time_step
 
                     # recalculate the next acceleration
-                    if time_index < len(self.steering_profiles) - 1:
-                        next_velocity = (
-                            self.steering_profiles[time_index + 1]
-                            .state[module_index]
-                            .first_derivative
-                        )
-                        next_time_fraction = self.steering_profiles[
-                            time_index + 1
-                        ].time_fraction
-                        self.steering_profiles[time_index + 1].state[
-                            module_index
-                        ].second_derivative = (
-                            next_velocity
-                            - time_pair.state[module_index].first_derivative
+                    if has_next_point:
+                        next_accelerations[module_index] = (
+                            next_velocities[module_index] - velocity
                         ) / next_time_fraction
 
+        self.time_fractions[:] = time_fractions
+        self.steering_velocities[:] = steering_velocities
+        self.steering_accelerations[:] = steering_accelerations
+
         # limit the drive velocity
         # For each timestep find the biggest values in the drive velocity/acceleration/jerk
-        self.calculate_velocities()
-        self.calculate_accelerations()
-        for time_index, time_pair in enumerate(self.velocity_profiles):
+        self.calculate_derrivatives()
+        drive_velocities: List[List[float]] = self.drive_velocities.tolist()
+        for time_index in range(point_count):
+            velocities = drive_velocities[time_index]
             max_drive_velocity = 0.0
             max_drive_velocity_index = -1
 
-            for module_index in range(len(self.drive_modules)):
-                drive_velocity = abs(time_pair.state[module_index].value)
+            for module_index in range(module_count):
+                drive_velocity = abs(velocities[module_index])
 
                 if drive_velocity > max_drive_velocity:
                     max_drive_velocity = drive_velocity
                     max_drive_velocity_index = module_index
 
             # Limit the drive velocity. Assume a linear change between the previous point and the current one.
-            if (
-                max_drive_velocity
-                > self.drive_modules[
-                    max_drive_velocity_index
-                ].drive_motor_maximum_velocity
-            ):
-                reduction_ratio = (
-                    self.drive_modules[
-                        max_drive_velocity_index
-                    ].drive_motor_maximum_velocity
-                    / max_drive_velocity
-                )
+            maximum_velocity = self.drive_modules[
+                max_drive_velocity_index
+            ].drive_motor_maximum_velocity
+            if max_drive_velocity > maximum_velocity:
+                reduction_ratio = maximum_velocity / max_drive_velocity
 
                 # Reduce all the velocities
-                for module_index in range(len(self.drive_modules)):
-                    time_pair.state[module_index].value = (
-                        time_pair.state[module_index].value * reduction_ratio
+                for module_index in range(module_count):
+                    velocities[module_index] = (
+                        velocities[module_index] * reduction_ratio
                     )
 
                 # Increase the timestep so that we end up in the same location
-                time_pair.time_fraction = time_pair.time_fraction / reduction_ratio
-                self.steering_profiles[time_index].time_fraction = (
-                    self.steering_profiles[time_index].time_fraction / reduction_ratio
+                time_fractions[time_index] = (
+                    time_fractions[time_index] / reduction_ratio
                 )
 
                 # TODO: Adjust steering velocity etc. etc.
 
+        self.time_fractions[:] = time_fractions
+        self.drive_velocities[:] = drive_velocities
+
 
 class BodyControlledDriveModuleProfile(ModuleStateProfile):
     def __init__(
@@ -975,25 +854,29 @@ class BodyControlledDriveModuleProfile(ModuleStateProfile):
         previous_drive_velocities: List[float] = [x.value for x in start_drive_velocity]
 
         # Iterate over all the internal frames and 1 extra to include the end state
+        body_motions: List[BodyMotion] = []
         for frame_index in range(1, number_of_frames + 1):
             time_fraction = float(frame_index) / float(number_of_frames)
-            body_motion_at_time = BodyMotion(
-                body_profiles[0].value_at(time_fraction),
-                body_profiles[1].value_at(time_fraction),
-                body_profiles[5].value_at(time_fraction),
-                0.0,
-                0.0,
-                0.0,
-                0.0,
-                0.0,
-                0.0,
-            )
-
-            drive_module_states = (
-                self.control_model.state_of_wheel_modules_from_body_motion(
-                    body_motion_at_time
+            body_motions.append(
+                BodyMotion(
+                    body_profiles[0].value_at(time_fraction),
+                    body_profiles[1].value_at(time_fraction),
+                    body_profiles[5].value_at(time_fraction),
+                    0.0,
+                    0.0,
+                    0.0,
+                    0.0,
+                    0.0,
+                    0.0,
                 )
             )
+
+        # The drive module states for all the frames are independent of each other, so compute
+        # them in one go. Selecting the direction does depend on the previous frame.
+        drive_module_states_for_frames = (
+            self.control_model.state_of_wheel_modules_from_body_motions(body_motions)
+        )
+        for drive_module_states in drive_module_states_for_frames:
             current_steering_orientation, current_drive_velocity = (
                 select_directions_for_modules(
                     self.modules,
@@ -1018,10 +901,17 @@ class BodyControlledDriveModuleProfile(ModuleStateProfile):
         # Limits based on: https://journals.sagepub.com/doi/10.5772/51153
         calculated_profiles.limit_profiles()
 
-        profile_total_time = sum(
-            [x.time_fraction for x in calculated_profiles.steering_profiles]
+        # Read the limited profiles back as plain floats
+        time_fractions: List[float] = calculated_profiles.time_fractions.tolist()
+        steering_angles: List[List[float]] = (
+            calculated_profiles.steering_angles.tolist()
+        )
+        drive_velocities: List[List[float]] = (
+            calculated_profiles.drive_velocities.tolist()
         )
 
+        profile_total_time = sum(time_fractions)
+
         # with open("h://temp//4ws//steering_profile.csv", "w") as steering_file:
         #    steering_file.write("time,")
         #    steering_file.write(f"steering_angle,")
@@ -1032,43 +922,43 @@ class BodyControlledDriveModuleProfile(ModuleStateProfile):
             profiles[self.modules[module_index].name] = [
                 # Steering orientation
                 SingleVariableMultiPointLinearProfile(
-                    calculated_profiles.steering_profiles[0].state[module_index].value,
-                    calculated_profiles.steering_profiles[-1].state[module_index].value,
+                    steering_angles[0][module_index],
+                    steering_angles[-1][module_index],
                     end_time=profile_total_time,
                     coordinate_space=PeriodicBoundedCircularSpace(),
                 ),
                 # Drive velocity
                 SingleVariableMultiPointLinearProfile(
-                    calculated_profiles.velocity_profiles[0].state[module_index].value,
-                    calculated_profiles.velocity_profiles[-1].state[module_index].value,
+                    drive_velocities[0][module_index],
+                    drive_velocities[-1][module_index],
                     end_time=profile_total_time,
                 ),
             ]
 
         # steering_file.write(f"{ 0.0 },")
-        # steering_file.write(f"{ calculated_profiles.steering_profiles[0].state[0].value },")
+        # steering_file.write(f"{ steering_angles[0][0] },")
         # steering_file.write("\n")
 
         time_to_now = 0.0
-        for i in range(1, len(calculated_profiles.steering_profiles) - 1):
-            time_to_now += calculated_profiles.steering_profiles[i].time_fraction
-            module_steering_values = calculated_profiles.steering_profiles[i].state
-            module_drive_values = calculated_profiles.velocity_profiles[i].state
+        for i in range(1, len(time_fractions) - 1):
+            time_to_now += time_fractions[i]
+            module_steering_values = steering_angles[i]
+            module_drive_values = drive_velocities[i]
 
             for module_index in range(len(self.modules)):
                 profiles[self.modules[module_index].name][0].add_value(
-                    time_to_now, module_steering_values[module_index].value
+                    time_to_now, module_steering_values[module_index]
                 )
                 profiles[self.modules[module_index].name][1].add_value(
-                    time_to_now, module_drive_values[module_index].value
+                    time_to_now, module_drive_values[module_index]
                 )
 
             # steering_file.write(f"{ time_to_now },")
-            # steering_file.write(f"{ module_steering_values[0].value },")
+            # steering_file.write(f"{ module_steering_values[0] },")
             # steering_file.write("\n")
 
         # steering_file.write(f"{ time_to_now },")
-        # steering_file.write(f"{ calculated_profiles.steering_profiles[-1].state[0].value },")
+        # steering_file.write(f"{ steering_angles[-1][0] },")
         # steering_file.write("\n")
 
         self.module_profiles = profiles
@@ -1,6 +1,8 @@
 import math
 from typing import List
 
+import numpy as np
+
 # locals
 from swerve_controller.control_model import (
     SimpleFourWheelSteeringControlModel,
@@ -483,6 +485,62 @@ def test_should_show_pure_rotation_movement_when_modules_are_pointing_left_diago
     assert math.isclose(motion.angular_velocity.z, 1.0, rel_tol=1e-6, abs_tol=1e-15)
 
 
+# body_motion_from_wheel_module_values
+
+
+def test_should_match_module_state_results_when_computing_from_module_values():
+    drive_modules = create_drive_modules()
+    controller = SimpleFourWheelSteeringControlModel(drive_modules)
+
+    steering_angles = [
+        math.radians(10),
+        math.radians(135),
+        math.radians(-100),
+        math.radians(45),
+    ]
+    drive_velocities = [1.0, 0.5, -0.25, 2.0]
+
+    states: List[DriveModuleMeasuredValues] = []
+    for i in range(len(drive_modules)):
+        module_state = DriveModuleMeasuredValues(
+            drive_modules[i].name,
+            drive_modules[i].steering_axis_xy_position.x,
+            drive_modules[i].steering_axis_xy_position.y,
+            steering_angles[i],
+            0.0,
+            0.0,
+            0.0,
+            drive_velocities[i],
+            0.0,
+            0.0,
+        )
+        states.append(module_state)
+
+    expected_motion = controller.body_motion_from_wheel_module_states(states)
+    motion = controller.body_motion_from_wheel_module_values(
+        np.array(steering_angles), np.array(drive_velocities)
+    )
+
+    assert math.isclose(
+        motion.linear_velocity.x,
+        expected_motion.linear_velocity.x,
+        rel_tol=1e-6,
+        abs_tol=1e-15,
+    )
+    assert math.isclose(
+        motion.linear_velocity.y,
+        expected_motion.linear_velocity.y,
+        rel_tol=1e-6,
+        abs_tol=1e-15,
+    )
+    assert math.isclose(
+        motion.angular_velocity.z,
+        expected_motion.angular_velocity.z,
+        rel_tol=1e-6,
+        abs_tol=1e-15,
+    )
+
+
 # state_of_wheel_modules_from_body_motion
 
 
@@ -908,3 +966,47 @@ def test_should_not_move_wheels_when_stopping():
             rel_tol=1e-6,
             abs_tol=1e-15,
         )
+
+
+# state_of_wheel_modules_from_body_motions
+
+
+def test_should_match_single_motion_results_when_computing_multiple_motions():
+    drive_modules = create_drive_modules()
+    controller = SimpleFourWheelSteeringControlModel(drive_modules)
+
+    motions: List[BodyMotion] = [
+        BodyMotion(1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+        BodyMotion(-1.0, 0.5, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+        BodyMotion(0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+        BodyMotion(0.5, -0.5, -1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+        BodyMotion(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+    ]
+
+    proposed_states = controller.state_of_wheel_modules_from_body_motions(motions)
+
+    assert len(proposed_states) == len(motions)
+
+    for motion_index in range(len(motions)):
+        expected_states = controller.state_of_wheel_modules_from_body_motion(
+            motions[motion_index]
+        )
+        states = proposed_states[motion_index]
+
+        assert len(states) == len(drive_modules)
+
+        for i in range(len(states)):
+            for direction in range(2):
+                assert states[i][direction].name == drive_modules[i].name
+                assert math.isclose(
+                    states[i][direction].steering_angle_in_radians,
+                    expected_states[i][direction].steering_angle_in_radians,
+                    rel_tol=1e-6,
+                    abs_tol=1e-15,
+                )
+                assert math.isclose(
+                    states[i][direction].drive_velocity_in_meters_per_second,
+                    expected_states[i][direction].drive_velocity_in_meters_per_second,
+                    rel_tol=1e-6,
+                    abs_tol=1e-15,
+                )
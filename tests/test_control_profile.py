@@ -1,6 +1,7 @@
 import math
 from typing import List
 
+import numpy as np
 import pytest
 
 # locals
@@ -14,6 +15,8 @@ from swerve_controller.control_profile import (
     BodyControlledDriveModuleProfile,
     BodyMotionProfile,
     DriveModuleStateProfile,
+    LimitedDriveModuleProfile,
+    ValueDerrivativeSet,
 )
 from swerve_controller.drive_module import DriveModule
 from swerve_controller.errors import IncompleteTrajectoryException
@@ -1390,6 +1393,130 @@ def test_drive_module_trajectory_should_create_trajectory_for_sideways_to_rotati
         )
 
 
+# LimitedDriveModuleProfile
+
+
+def create_limited_profile(
+    drive_modules: List[DriveModule],
+    time_steps: List[float],
+    steering_angles: List[List[float]],
+    drive_velocities: List[List[float]],
+) -> LimitedDriveModuleProfile:
+    profile = LimitedDriveModuleProfile(drive_modules)
+    profile.add_start_point(
+        time_steps[0],
+        [ValueDerrivativeSet(x, 0.0, 0.0, 0.0) for x in steering_angles[0]],
+        [ValueDerrivativeSet(x, 0.0, 0.0, 0.0) for x in drive_velocities[0]],
+    )
+    for time_step, angles, velocities in zip(
+        time_steps[1:], steering_angles[1:], drive_velocities[1:]
+    ):
+        profile.add_profile_point(time_step, angles, velocities)
+
+    return profile
+
+
+def test_limited_profile_should_calculate_derivatives_when_within_limits():
+    drive_modules = create_drive_modules()
+
+    steering_angles = [[0.0, 0.0, 0.0, 0.0], [0.25] * 4, [0.5] * 4, [0.625] * 4]
+    drive_velocities = [[0.0, 0.0, 0.0, 0.0], [0.25] * 4, [0.5] * 4, [0.4] * 4]
+    profile = create_limited_profile(
+        drive_modules, [0.0, 0.5, 0.5, 0.5], steering_angles, drive_velocities
+    )
+
+    profile.limit_profiles()
+
+    np.testing.assert_allclose(profile.time_fractions, [0.0, 0.5, 0.5, 0.5])
+    np.testing.assert_allclose(profile.steering_angles, steering_angles)
+    np.testing.assert_allclose(profile.drive_velocities, drive_velocities)
+
+    # The steering derivatives are zero for the first point and the difference with the
+    # previous point divided by the time step for all other points
+    for module_index in range(len(drive_modules)):
+        np.testing.assert_allclose(
+            profile.steering_velocities[:, module_index], [0.0, 0.5, 0.5, 0.25]
+        )
+        np.testing.assert_allclose(
+            profile.steering_accelerations[:, module_index], [0.0, 1.0, 0.0, -0.5]
+        )
+        np.testing.assert_allclose(
+            profile.steering_jerks[:, module_index], [0.0, 2.0, -2.0, -1.0]
+        )
+
+    # The drive acceleration and jerk are zero for the first and the last point
+    for module_index in range(len(drive_modules)):
+        np.testing.assert_allclose(
+            profile.drive_accelerations[:, module_index], [0.0, 0.5, 0.5, 0.0]
+        )
+        np.testing.assert_allclose(
+            profile.drive_jerks[:, module_index], [0.0, 1.0, 0.0, 0.0]
+        )
+
+
+def test_limited_profile_should_limit_steering_velocity():
+    drive_modules = create_drive_modules()
+
+    steering_angles = [
+        [0.0, 0.0, 0.0, 0.0],
+        [2.0, 0.0, 0.0, 0.0],
+        [2.0, 0.0, 0.0, 0.0],
+    ]
+    drive_velocities = [[0.0, 0.0, 0.0, 0.0]] * 3
+    profile = create_limited_profile(
+        drive_modules, [0.0, 1.0, 1.0], steering_angles, drive_velocities
+    )
+
+    profile.limit_profiles()
+
+    # The time step leading up to the second point is stretched so that the steering velocity
+    # is at the maximum of 1.0 rad/s
+    np.testing.assert_allclose(profile.time_fractions, [0.0, 2.0, 1.0])
+    np.testing.assert_allclose(profile.steering_angles, steering_angles)
+
+    np.testing.assert_allclose(profile.steering_velocities[:, 0], [0.0, 1.0, 0.0])
+    np.testing.assert_allclose(profile.steering_accelerations[:, 0], [0.0, 0.5, -1.0])
+    np.testing.assert_allclose(profile.steering_jerks[:, 0], [0.0, 0.25, -1.5])
+
+    np.testing.assert_allclose(profile.steering_velocities[:, 1:], 0.0)
+    np.testing.assert_allclose(profile.steering_accelerations[:, 1:], 0.0)
+    np.testing.assert_allclose(profile.steering_jerks[:, 1:], 0.0)
+
+
+def test_limited_profile_should_limit_drive_velocity():
+    drive_modules = create_drive_modules()
+
+    steering_angles = [[0.0, 0.0, 0.0, 0.0]] * 3
+    drive_velocities = [
+        [0.0, 0.0, 0.0, 0.0],
+        [2.0, 1.0, 1.0, 1.0],
+        [0.5, 0.25, 0.25, 0.25],
+    ]
+    profile = create_limited_profile(
+        drive_modules, [0.0, 0.5, 0.5], steering_angles, drive_velocities
+    )
+
+    profile.limit_profiles()
+
+    # All the drive velocities of the second point are scaled so that the fastest module is at
+    # the maximum of 1.0 m/s, and the time step leading up to the point is stretched by the
+    # same ratio
+    np.testing.assert_allclose(profile.time_fractions, [0.0, 1.0, 0.5])
+    np.testing.assert_allclose(
+        profile.drive_velocities,
+        [
+            [0.0, 0.0, 0.0, 0.0],
+            [1.0, 0.5, 0.5, 0.5],
+            [0.5, 0.25, 0.25, 0.25],
+        ],
+    )
+
+    np.testing.assert_allclose(profile.drive_accelerations[0], 0.0)
+    np.testing.assert_allclose(profile.drive_accelerations[-1], 0.0)
+    np.testing.assert_allclose(profile.drive_jerks[0], 0.0)
+    np.testing.assert_allclose(profile.drive_jerks[-1], 0.0)
+
+
 # BodyControlledDriveModuleProfile
 
 